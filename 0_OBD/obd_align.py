@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# As-of alignment of the OBD and charger streams on their numeric timestamps
+# (int64 epoch ms, see obd_io). Both streams are sorted once and every
+# target time is located with a binary search (np.searchsorted), so
+# aligning n rows against m rows costs O((n + m) log m).
+
+# The charger logs local time (UTC+2) labelled as UTC, so its timestamps run
+# 2 h ahead of the OBD ones. Added to the charger timestamps before aligning.
+CHARGER_OFFSET_MS = -7_200_000
+TOLERANCE_MS = 500  # max distance to a sample used for a target time
+
+
+def asof(times, timestamp, values, tolerance=TOLERANCE_MS, interpolate=True):
+    """
+    Values of a stream (timestamp, values: 1-D or rows x columns) at the
+    target times. With interpolate, a target between two samples that are
+    both within tolerance is linearly interpolated; otherwise the nearest
+    sample within tolerance is used. Targets with no sample within tolerance
+    get NaN. timestamp must be sorted.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    timestamp = np.asarray(timestamp, dtype=np.int64)
+    values = np.asarray(values)
+    out_dtype = np.result_type(values.dtype, np.float32)
+    if timestamp.size == 0:
+        return np.full(times.shape + values.shape[1:], np.nan, dtype=out_dtype)
+
+    right = np.searchsorted(timestamp, times, side='left')  # first sample at or after t
+    left = np.clip(right - 1, 0, timestamp.size - 1)
+    right = np.clip(right, 0, timestamp.size - 1)
+    d_left = times - timestamp[left]
+    d_right = timestamp[right] - times
+    ok_left = (d_left >= 0) & (d_left <= tolerance)
+    ok_right = (d_right >= 0) & (d_right <= tolerance)
+
+    nearest = np.where(ok_right & (~ok_left | (d_right < d_left)), right, left)
+    result = values[nearest].astype(out_dtype)
+    if interpolate:
+        both = ok_left & ok_right & (right != left)
+        span = (timestamp[right] - timestamp[left])[both]
+        weight = (d_left[both] / span).astype(out_dtype)
+        if values.ndim > 1:
+            weight = weight[:, None]
+        result[both] = (1 - weight) * values[left[both]] + weight * values[right[both]]
+    result[~(ok_left | ok_right)] = np.nan
+    return result
+
+
+def _sorted(df):
+    order = np.argsort(df['timestamp'].to_numpy(), kind='stable')
+    return df.iloc[order]
+
+
+def align(obd, charger, base='obd', tolerance=TOLERANCE_MS, interpolate=True, charger_offset=CHARGER_OFFSET_MS):
+    """
+    Both streams on one time base: 'obd' or 'charger' (that stream's own
+    timestamps) or a period in ms (uniform grid over the overlap of the two
+    streams). Returns a DataFrame with `timestamp` and the columns of both
+    streams prefixed obd_ / charger_; charger timestamps are shifted by
+    charger_offset first.
+    """
+    obd = _sorted(obd)
+    charger = _sorted(charger.assign(timestamp=charger['timestamp'] + charger_offset))
+    if base == 'obd':
+        times = obd['timestamp'].to_numpy()
+    elif base == 'charger':
+        times = charger['timestamp'].to_numpy()
+    else:
+        start = max(obd['timestamp'].iloc[0], charger['timestamp'].iloc[0])
+        stop = min(obd['timestamp'].iloc[-1], charger['timestamp'].iloc[-1])
+        times = np.arange(start, stop + 1, int(base), dtype=np.int64)
+
+    aligned = {'timestamp': times}
+    for prefix, df in (('obd', obd), ('charger', charger)):
+        columns = [name for name in df.columns if name not in ('timestamp', 'datetime')]
+        values = asof(times, df['timestamp'].to_numpy(), df[columns].to_numpy(), tolerance, interpolate)
+        for i, name in enumerate(columns):
+            aligned[f'{prefix}_{name}'] = values[:, i]
+    return pd.DataFrame(aligned)
+
+
+def compare(aligned, columns=('voltage', 'soc', 'current')):
+    """Mean, mean absolute and max absolute difference (charger - OBD) per column, over rows where both exist."""
+    rows = {}
+    for name in columns:
+        diff = aligned[f'charger_{name}'] - aligned[f'obd_{name}']
+        diff = diff[diff.notna()]
+        rows[name] = {'rows': len(diff), 'mean': diff.mean(), 'mean_abs': diff.abs().mean(), 'max_abs': diff.abs().max()}
+    return pd.DataFrame(rows).T
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from obd_io import COLUMNS, read_log
+
+# Compact columnar archive of one session (OBD + charger stream) per file.
+#
+#   'OBDARCH1' | uint64 header length | JSON header | blocks
+#
+# The blocks start at the first 64-byte boundary after the header (block
+# offsets in the header are relative to that point) and are each 64-byte
+# aligned. A block holds one little-endian typed column: float32 values, or
+# the timestamps as the deltas between consecutive rows (the first value is
+# in the header) in the smallest of int16/int32/int64 that fits
+# (~100 ms steps -> 2 bytes per row).
+# Archive() memory-maps the file, so opening it costs only the header read;
+# value columns are views on the map and timestamps are decoded on first use.
+
+MAGIC = b'OBDARCH1'
+ALIGN = 64
+EXTENSION = '.obda'
+
+
+def _delta_dtype(deltas):
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if deltas.size == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+            return np.dtype(dtype).newbyteorder('<')
+    return np.dtype('<i8')
+
+
+def write_session(path, streams, session=None):
+    """streams: {'obd': DataFrame, 'charger': DataFrame} as returned by obd_io.read_log()."""
+    header = {'version': 1, 'session': session, 'streams': {}}
+    blocks = []
+    position = 0  # relative to the data section, which starts at the first ALIGN boundary after the header
+    for kind, df in streams.items():
+        timestamp = df['timestamp'].to_numpy(dtype=np.int64)
+        deltas = np.diff(timestamp)
+        deltas = deltas.astype(_delta_dtype(deltas))
+        entry = {'rows': len(df), 'first': int(timestamp[0]) if len(df) else 0, 'columns': {}}
+        entry['timestamp'] = {'dtype': deltas.dtype.str, 'offset': position}
+        blocks.append(deltas)
+        position = _aligned(position + deltas.nbytes)
+        for name in COLUMNS[kind]:
+            values = df[name].to_numpy(dtype='<f4')
+            entry['columns'][name] = {'dtype': values.dtype.str, 'offset': position}
+            blocks.append(values)
+            position = _aligned(position + values.nbytes)
+        header['streams'][kind] = entry
+
+    encoded = json.dumps(header).encode('utf-8')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(encoded)).tobytes())
+        f.write(encoded)
+        for values in blocks:
+            f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+            f.write(values.tobytes())
+    os.replace(tmp_path, path)  # an interrupted conversion keeps the previous archive
+    return path
+
+
+def _aligned(position):
+    return -(-position // ALIGN) * ALIGN
+
+
+def convert(obd_path, charger_path, out_path, session=None):
+    return write_session(out_path, {'obd': read_log(obd_path, 'obd'), 'charger': read_log(charger_path, 'charger')}, session)
+
+
+def convert_directory(directory, out_dir=None):
+    """Converts every session pair in directory (see obd_batch.find_sessions) to <out_dir>/<session>.obda."""
+    from obd_batch import find_sessions
+    out_dir = out_dir or directory
+    os.makedirs(out_dir, exist_ok=True)
+    return [convert(obd_path, charger_path, os.path.join(out_dir, session + EXTENSION), session)
+            for session, (obd_path, charger_path) in find_sessions(directory).items()]
+
+
+class Archive:
+    def __init__(self, path):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        if bytes(self._map[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f'{path}: not an OBD session archive')
+        length = int(self._map[len(MAGIC):len(MAGIC) + 8].view('<u8')[0])
+        start = len(MAGIC) + 8
+        self.header = json.loads(bytes(self._map[start:start + length]).decode('utf-8'))
+        self._data = _aligned(start + length)
+        self.session = self.header['session']
+        self.streams = self.header['streams']
+        self._timestamps = {}
+
+    def _block(self, spec, rows):
+        dtype = np.dtype(spec['dtype'])
+        offset = self._data + spec['offset']
+        return self._map[offset:offset + rows * dtype.itemsize].view(dtype)
+
+    def column(self, kind, name):
+        """Read-only float32 view on the mapped file."""
+        stream = self.streams[kind]
+        return self._block(stream['columns'][name], stream['rows'])
+
+    def timestamp(self, kind):
+        """int64 epoch ms, decoded from the deltas once per stream."""
+        if kind not in self._timestamps:
+            stream = self.streams[kind]
+            deltas = self._block(stream['timestamp'], max(stream['rows'] - 1, 0))
+            timestamp = np.empty(stream['rows'], dtype=np.int64)
+            if stream['rows']:
+                timestamp[0] = stream['first']
+                np.cumsum(deltas, dtype=np.int64, out=timestamp[1:])
+                timestamp[1:] += stream['first']
+            self._timestamps[kind] = timestamp
+        return self._timestamps[kind]
+
+    def frame(self, kind, columns=None):
+        """DataFrame in the obd_io.read_log() layout (timestamp + float32 columns)."""
+        columns = list(self.streams[kind]['columns']) if columns is None else list(columns)
+        data = {'timestamp': self.timestamp(kind)}
+        data.update({name: self.column(kind, name) for name in columns})
+        return pd.DataFrame(data, copy=False)
+
+    def __getitem__(self, kind):
+        return self.frame(kind)
+
+
+def open_archive(path):
+    return Archive(path)
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    for path in convert_directory(directory):
+        archive = Archive(path)
+        session = archive.session
+        csv_size = sum(os.path.getsize(os.path.join(directory, f'{session}_{suffix}.csv')) for suffix in ('OBD', 'charger'))
+        rows = {kind: stream['rows'] for kind, stream in archive.streams.items()}
+        print(f'{session}: {csv_size / 1e6:.2f} MB csv -> {os.path.getsize(path) / 1e6:.2f} MB archive, rows {rows}')
@@ -0,0 +1,90 @@
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from obd_io import read_log
+
+# Batch analysis of every session in a directory. A session is a pair
+# <id>_OBD.csv / <id>_charger.csv; each pair is read and reduced to one row
+# of statistics in its own worker process, and the rows are merged into a
+# summary table with an 'ALL' row over all sessions.
+
+SESSION = re.compile(r'^(?P<session>.+)_(?P<kind>OBD|charger)\.csv$', re.IGNORECASE)
+
+
+def find_sessions(directory):
+    """{session id: (obd path, charger path)} for every complete pair in directory, sorted by id."""
+    found = {}
+    for name in os.listdir(directory):
+        match = SESSION.match(name)
+        if match:
+            found.setdefault(match['session'], {})[match['kind'].lower()] = os.path.join(directory, name)
+    return {session: (paths['obd'], paths['charger'])
+            for session, paths in sorted(found.items()) if {'obd', 'charger'} <= set(paths)}
+
+
+def session_stats(session, obd_path, charger_path):
+    obd = read_log(obd_path, 'obd')
+    charger = read_log(charger_path, 'charger')
+    energy = charger['charged_energy'].dropna()  # cumulative counter [Wh]
+    stats = {
+        'session': session,
+        'obd_rows': len(obd),
+        'charger_rows': len(charger),
+        'duration_s': (charger['timestamp'].max() - charger['timestamp'].min()) / 1000.0,
+        'charged_energy': float(energy.iloc[-1] - energy.iloc[0]) if len(energy) else np.nan,
+    }
+    for prefix, df, columns in (('charger', charger, ('voltage', 'current', 'soc')),
+                                ('obd', obd, ('voltage', 'current', 'soc', 'temperature'))):
+        for name in columns:
+            values = df[name].to_numpy(dtype=np.float64)
+            values = values[~np.isnan(values)]
+            stats[f'{prefix}_{name}_n'] = values.size
+            stats[f'{prefix}_{name}_mean'] = values.mean() if values.size else np.nan
+    temperature = obd['temperature'].dropna()
+    stats['obd_temperature_min'] = temperature.min()
+    stats['obd_temperature_max'] = temperature.max()
+    return stats
+
+
+def _session_stats(args):
+    return session_stats(*args)
+
+
+def merge(rows):
+    """Summary table: one row per session plus 'ALL' (count-weighted means, summed energy, overall min/max)."""
+    table = pd.DataFrame(rows).set_index('session')
+    total = {'obd_rows': table['obd_rows'].sum(), 'charger_rows': table['charger_rows'].sum(),
+             'duration_s': table['duration_s'].sum(), 'charged_energy': table['charged_energy'].sum(),
+             'obd_temperature_min': table['obd_temperature_min'].min(),
+             'obd_temperature_max': table['obd_temperature_max'].max()}
+    for column in table.columns:
+        if column.endswith('_mean'):
+            n = table[column[:-len('_mean')] + '_n']
+            total[column] = (table[column] * n).sum() / n.sum() if n.sum() else np.nan
+            total[column[:-len('_mean')] + '_n'] = n.sum()
+    table.loc['ALL'] = pd.Series(total)
+    table = table.astype({'obd_rows': np.int64, 'charger_rows': np.int64})
+    return table.drop(columns=[c for c in table.columns if c.endswith('_n')])
+
+
+def run(directory, workers=None):
+    sessions = find_sessions(directory)
+    jobs = [(session,) + paths for session, paths in sessions.items()]
+    if not jobs:
+        raise FileNotFoundError(f'no <id>_OBD.csv / <id>_charger.csv pairs in {directory}')
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        rows = [_session_stats(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(_session_stats, jobs))
+    return merge(rows)
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(run(directory))
@@ -0,0 +1,76 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Typed, chunked reader for the *_OBD.csv and *_charger.csv session logs.
+# Only the numeric columns are read: the duplicate `datetime` string columns
+# are dropped by the parser and time comes from the numeric `timestamp`
+# column, normalised to int64 epoch milliseconds (OBD logs store ms, or
+# seconds in some sessions; charger logs store seconds).
+
+CHUNKSIZE = 100_000
+
+COLUMNS = {
+    'obd': ['current', 'voltage', 'soc', 'temperature'],
+    'charger': ['voltage', 'current', 'soc', 'power', 'charged_energy', 'derivative', 'mean_derivative'],
+}
+
+MS_THRESHOLD = 1e11  # epoch values above this are milliseconds (1e11 s is the year 5138)
+
+
+def log_kind(path):
+    name = os.path.basename(path).lower()
+    if name.endswith('_obd.csv'):
+        return 'obd'
+    if name.endswith('_charger.csv'):
+        return 'charger'
+    with open(path, encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+    for kind, columns in COLUMNS.items():
+        if set(columns) <= set(header) and len(columns) + 3 >= len(header):
+            return kind
+    raise ValueError(f'{path}: not an OBD or charger log (columns: {header})')
+
+
+def to_milliseconds(timestamp):
+    # decided per value: some OBD logs in ms contain single rows written in seconds
+    timestamp = np.asarray(timestamp, dtype=np.float64)
+    timestamp = np.where(timestamp < MS_THRESHOLD, timestamp * 1000.0, timestamp)
+    return np.rint(timestamp).astype(np.int64)
+
+
+def csv_options(kind):
+    """pd.read_csv keyword arguments that read only the typed numeric columns of a log of this kind."""
+    dtypes = {name: np.float32 for name in COLUMNS[kind]}
+    dtypes['timestamp'] = np.float64  # some logs store fractional seconds; float32 would lose the ms
+    wanted = set(dtypes)
+    return {'usecols': lambda name: name in wanted, 'dtype': dtypes, 'engine': 'c'}
+
+
+def normalise(chunk, kind):
+    chunk['timestamp'] = to_milliseconds(chunk['timestamp'].to_numpy())
+    return chunk[['timestamp'] + COLUMNS[kind]].reset_index(drop=True)
+
+
+def read_chunks(path, kind=None, chunksize=CHUNKSIZE):
+    """Yield the log as DataFrames of at most chunksize rows: int64 `timestamp` [ms] plus float32 columns."""
+    kind = kind or log_kind(path)
+    with pd.read_csv(path, chunksize=chunksize, **csv_options(kind)) as reader:
+        for chunk in reader:
+            yield normalise(chunk, kind)
+
+
+def read_log(path, kind=None, chunksize=CHUNKSIZE):
+    chunks = list(read_chunks(path, kind, chunksize))
+    if not chunks:
+        kind = kind or log_kind(path)
+        return pd.DataFrame({name: pd.Series(dtype=np.int64 if name == 'timestamp' else np.float32)
+                             for name in ['timestamp'] + COLUMNS[kind]})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def with_datetime(df):
+    """Adds a `datetime` column (UTC) computed from `timestamp`, e.g. for plotting."""
+    df = df.copy()
+    df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
@@ -0,0 +1,85 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from obd_align import CHARGER_OFFSET_MS
+
+# One HTML report per session: charger and OBD voltage, SOC and OBD
+# temperature on three rows with a shared time axis. Each trace is decimated
+# to about screen resolution with min/max bucketing (the time span is cut
+# into equal buckets and each bucket keeps its first, last, lowest and
+# highest sample, in time order), so spikes and dips survive while the file
+# size no longer grows with the session length. Traces use WebGL (Scattergl).
+
+STREAMS = {'obd': 'OBD', 'charger': 'Charger'}
+POINTS = 2000  # per trace; ~4 per bucket, so about 500 buckets across the plot width
+
+ROWS = (
+    ('Voltage (V)', (('charger', 'voltage'), ('obd', 'voltage'))),
+    ('SOC (%)', (('charger', 'soc'), ('obd', 'soc'))),
+    ('Temperature (°C)', (('obd', 'temperature'),)),
+)
+
+
+def minmax(timestamp, values, points=POINTS):
+    """Indices of the samples kept by min/max bucketing (sorted, NaNs dropped); timestamp must be sorted."""
+    timestamp = np.asarray(timestamp)
+    index = np.flatnonzero(~np.isnan(np.asarray(values, dtype=np.float64)))
+    if index.size <= points:
+        return index
+    values = np.asarray(values)[index]
+    timestamp = timestamp[index]
+    edges = np.linspace(timestamp[0], timestamp[-1], points // 4 + 1)[:-1]
+    starts = np.unique(np.searchsorted(timestamp, edges, side='left'))  # empty buckets collapse
+    stops = np.append(starts[1:], index.size)
+    bucket = np.repeat(np.arange(starts.size), stops - starts)
+    order = np.lexsort((values, bucket))  # by bucket, then by value
+    keep = np.concatenate([starts, stops - 1, order[starts], order[stops - 1]])
+    return index[np.unique(keep)]
+
+
+def decimate(df, column, points=POINTS):
+    """(timestamp, values) of one column after min/max bucketing."""
+    df = df if df['timestamp'].is_monotonic_increasing else df.sort_values('timestamp', kind='stable')
+    timestamp = df['timestamp'].to_numpy()
+    values = df[column].to_numpy()
+    keep = minmax(timestamp, values, points)
+    return timestamp[keep], values[keep]
+
+
+def report(obd, charger, title=None, points=POINTS, charger_offset=CHARGER_OFFSET_MS):
+    """Figure with the decimated traces of both streams; charger timestamps are shifted by charger_offset."""
+    streams = {'obd': obd, 'charger': charger.assign(timestamp=charger['timestamp'] + charger_offset)}
+    fig = make_subplots(rows=len(ROWS), cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                        subplot_titles=[label for label, _ in ROWS])
+    for row, (label, traces) in enumerate(ROWS, start=1):
+        for kind, column in traces:
+            timestamp, values = decimate(streams[kind], column, points)
+            fig.add_trace(go.Scattergl(x=pd.to_datetime(timestamp, unit='ms'), y=values, mode='lines',
+                                       name=f'{STREAMS[kind]} {column}'),
+                          row=row, col=1)
+        fig.update_yaxes(title_text=label, row=row, col=1)
+    fig.update_layout(title=title, height=300 * len(ROWS), hovermode='x unified')
+    return fig
+
+
+def write_report(obd, charger, path, title=None, points=POINTS, include_plotlyjs='cdn'):
+    """
+    Writes the report to path. include_plotlyjs='cdn' links plotly.js
+    instead of embedding it (~4.5 MB); pass True for a file that also works
+    offline.
+    """
+    report(obd, charger, title, points).write_html(path, include_plotlyjs=include_plotlyjs)
+    return path
+
+
+if __name__ == '__main__':
+    from obd_batch import find_sessions
+    from obd_io import read_log
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    for session, (obd_path, charger_path) in find_sessions(directory).items():
+        path = write_report(read_log(obd_path, 'obd'), read_log(charger_path, 'charger'),
+                            os.path.join(directory, f'{session}_report.html'), title=session)
+        print(f'{session}: {path} ({os.path.getsize(path) / 1e6:.2f} MB)')
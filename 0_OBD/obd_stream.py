@@ -0,0 +1,188 @@
+import io
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from obd_io import COLUMNS, csv_options, log_kind, normalise
+
+# Constant-memory statistics for OBD/charger logs that are still being
+# written. tail() yields the rows appended to a CSV since the last poll and
+# SessionMonitor folds each batch into running statistics: mean/variance
+# (Welford, merged batch-wise), min/max, the trapezoidal integral of
+# voltage * current and, for charger logs, the charged_energy counter.
+
+POLL_S = 1.0
+BLOCK_BYTES = 1 << 20  # read size per step, bounds the text held in memory
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream, updated with batches of values (NaNs are skipped)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        mean = values.mean()
+        self._combine(values.size, mean, np.square(values - mean).sum(), values.min(), values.max())
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count, mean, m2, low, high):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def as_dict(self):
+        empty = self.count == 0
+        return {'count': self.count, 'mean': np.nan if empty else self.mean, 'std': self.std,
+                'min': np.nan if empty else self.min, 'max': np.nan if empty else self.max}
+
+
+class EnergyIntegrator:
+    """Trapezoidal integral of power over time [Wh]; carries the last sample across batches."""
+
+    def __init__(self, max_gap_ms=10_000):
+        self.energy = 0.0
+        self.max_gap_ms = max_gap_ms  # longer gaps (logger paused) are not integrated
+        self._last = None
+
+    def update(self, timestamp, power):
+        timestamp = np.asarray(timestamp, dtype=np.int64)
+        power = np.asarray(power, dtype=np.float64)
+        keep = ~np.isnan(power)
+        timestamp, power = timestamp[keep], power[keep]
+        if timestamp.size == 0:
+            return
+        if self._last is not None:
+            timestamp = np.concatenate([[self._last[0]], timestamp])
+            power = np.concatenate([[self._last[1]], power])
+        dt = np.diff(timestamp)
+        valid = (dt > 0) & (dt <= self.max_gap_ms)
+        self.energy += np.sum((0.5 * (power[1:] + power[:-1]) * dt)[valid]) / 3.6e6
+        self._last = (timestamp[-1], power[-1])
+
+
+class SessionMonitor:
+    def __init__(self, kind):
+        self.kind = kind
+        self.stats = {name: RunningStats() for name in COLUMNS[kind]}
+        self.energy = EnergyIntegrator()
+        self.rows = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self._counter = None  # (first, last) charged_energy reading
+
+    def update(self, chunk):
+        if chunk.empty:
+            return
+        self.rows += len(chunk)
+        for name, stats in self.stats.items():
+            stats.update(chunk[name].to_numpy())
+        timestamp = chunk['timestamp'].to_numpy()
+        if self.first_timestamp is None:
+            self.first_timestamp = int(timestamp[0])
+        self.last_timestamp = int(timestamp[-1])
+        voltage = chunk['voltage'].to_numpy(dtype=np.float64)
+        current = chunk['current'].to_numpy(dtype=np.float64)
+        self.energy.update(timestamp, voltage * current)
+        if 'charged_energy' in chunk:
+            readings = chunk['charged_energy'].dropna()
+            if len(readings):
+                first = self._counter[0] if self._counter else float(readings.iloc[0])
+                self._counter = (first, float(readings.iloc[-1]))
+
+    def summary(self):
+        table = pd.DataFrame({name: stats.as_dict() for name, stats in self.stats.items()}).T
+        info = {'rows': self.rows, 'integrated_energy_Wh': self.energy.energy,
+                'duration_s': ((self.last_timestamp - self.first_timestamp) / 1000.0) if self.rows else 0.0}
+        if self._counter:
+            info['charged_energy_Wh'] = self._counter[1] - self._counter[0]
+        return table, info
+
+
+def tail(path, kind=None, follow=False, poll=POLL_S, timeout=None, block_bytes=BLOCK_BYTES):
+    """
+    Yield the typed rows of a CSV log (see obd_io) as they are appended.
+    The file is read in blocks of block_bytes and the complete lines of
+    each block are yielded as one DataFrame, so memory stays bounded however
+    long the log already is; a partially written last line waits for the
+    next read. Without follow it stops at the end of the file; with follow
+    it keeps polling until no new line arrives for timeout seconds (forever
+    if None).
+    """
+    kind = kind or log_kind(path)
+    options = csv_options(kind)
+    with open(path, encoding='utf-8', newline='') as f:
+        header = ''
+        idle_since = time.monotonic()
+        while not header.endswith('\n'):  # empty or just created, header still being written
+            line = f.readline()
+            header += line
+            if line:
+                idle_since = time.monotonic()
+            elif not follow or (timeout is not None and time.monotonic() - idle_since > timeout):
+                return
+            else:
+                time.sleep(poll)
+        pending = ''
+        while True:
+            block = f.read(block_bytes)
+            pending += block
+            end = pending.rfind('\n') + 1
+            if end:
+                lines, pending = pending[:end], pending[end:]
+                yield normalise(pd.read_csv(io.StringIO(header + lines), **options), kind)
+                idle_since = time.monotonic()
+            elif block:  # a line longer than one block
+                continue
+            elif not follow or (timeout is not None and time.monotonic() - idle_since > timeout):
+                return
+            else:
+                time.sleep(poll)
+
+
+def monitor(path, kind=None, follow=False, poll=POLL_S, timeout=None):
+    """Yields the updated SessionMonitor after every batch of new rows."""
+    kind = kind or log_kind(path)
+    session = SessionMonitor(kind)
+    for chunk in tail(path, kind, follow, poll, timeout):
+        session.update(chunk)
+        yield session
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), '2023051601_charger.csv')
+    follow = '--follow' in sys.argv
+    session = None
+    for session in monitor(path, follow=follow):
+        table, info = session.summary()
+        if follow:
+            print(f"{info['rows']} rows, {info['duration_s']:.1f} s, voltage {table.loc['voltage', 'mean']:.2f} V, "
+                  f"current {table.loc['current', 'mean']:.2f} A, {info['integrated_energy_Wh']:.1f} Wh")
+    if session is not None:
+        table, info = session.summary()
+        print(table)
+        print(info)
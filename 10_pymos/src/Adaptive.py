@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Adaptive.py
+#? Purpose:     Adaptive Vgs/Vds sweep that refines cells around region boundaries and steep Id gradients
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import numpy as np
+#? -------------------------------------------------------------------------------
+
+CUTOFF, LINEAR, SATURATION = 0, 1, 2
+
+def regions(model, Vgs, Vds, Vsb=0.0, T=350):
+    """Cutoff / linear / saturation per point; models without Equations (LUT, Verilog-A) report one region everywhere."""
+    if not hasattr(model, "eq"):
+        return np.full(np.shape(Vgs), CUTOFF)
+    Vsat            = Vgs - model.eq.compute_Vth_batch(Vsb, T)
+    return np.where(Vsat <= 0, CUTOFF, np.where(Vsat >= Vds, LINEAR, SATURATION))
+
+#? -------------------------------------------------------------------------------
+
+class AdaptiveSweep:
+    """
+    Quadtree refinement of the (Vgs, Vds) plane, one temperature at a time.
+    The sweep starts on a coarse x coarse grid; every cell whose four corners
+    are not all in the same region, or whose corner Id values differ by more
+    than the tolerance, is split into four, up to max_depth times. Points live
+    on an integer lattice of the finest level so shared corners are only
+    evaluated once, and each level is evaluated in one compute_batch() call.
+
+    id_tol is an absolute tolerance in A; when None it is rel_tol times the
+    largest |Id| seen on the coarse grid. Models without a threshold
+    voltage (no eq, see regions()) are refined on the Id criterion alone.
+    """
+    def __init__(self, model, coarse=9, max_depth=5, id_tol=None, rel_tol=0.02, Vsb=0.0):
+        if coarse < 2:
+            raise ValueError("coarse must be at least 2")
+        self.model      = model
+        self.coarse     = coarse
+        self.max_depth  = max_depth
+        self.id_tol     = id_tol
+        self.rel_tol    = rel_tol
+        self.Vsb        = Vsb
+        self.scale      = 2 ** max_depth
+        self.n_fine     = (coarse - 1) * self.scale
+
+    def _coords(self, ig, idd):
+        Vgs = self.Vgs_lo + ig  * ((self.Vgs_hi - self.Vgs_lo) / self.n_fine)
+        Vds = self.Vds_lo + idd * ((self.Vds_hi - self.Vds_lo) / self.n_fine)
+        return Vgs, Vds
+
+    def _key(self, ig, idd):
+        return ig.astype(np.int64) * (self.n_fine + 1) + idd
+
+    def _evaluate(self, ig, idd, T):
+        keys            = np.unique(self._key(ig, idd))
+        keys            = keys[~np.isin(keys, self.keys)]
+        if keys.size == 0:
+            return
+        Vgs, Vds        = self._coords(keys // (self.n_fine + 1), keys % (self.n_fine + 1))
+        Id,Cgs, Cgd, Cds = self.model.compute_batch(Vgs=Vgs, Vds=Vds, Vsb=self.Vsb, T=T)
+        region          = regions(self.model, Vgs, Vds, self.Vsb, T)
+        self.keys       = np.concatenate([self.keys, keys])
+        self.values     = np.concatenate([self.values, np.column_stack([Vgs, Vds, Id, Cgs, Cgd, Cds, region])])
+        order           = np.argsort(self.keys, kind="stable")
+        self.keys, self.values = self.keys[order], self.values[order]
+
+    def _lookup(self, ig, idd):
+        return self.values[np.searchsorted(self.keys, self._key(ig, idd))]
+
+    def run_T(self, T, Vgs_range, Vds_range):
+        (self.Vgs_lo, self.Vgs_hi), (self.Vds_lo, self.Vds_hi) = Vgs_range, Vds_range
+        self.keys       = np.empty(0, dtype=np.int64)
+        self.values     = np.empty((0, 7))
+
+        lattice         = np.arange(self.coarse) * self.scale
+        ig, idd         = np.meshgrid(lattice, lattice, indexing="ij")
+        self._evaluate(ig.ravel(), idd.ravel(), T)
+        id_tol          = self.id_tol
+        if id_tol is None:
+            id_tol      = self.rel_tol * np.abs(self.values[:, 2]).max()
+
+        g0, d0          = np.meshgrid(lattice[:-1], lattice[:-1], indexing="ij")
+        g0, d0          = g0.ravel(), d0.ravel()
+        width           = self.scale
+        for _ in range(self.max_depth):
+            g1, d1      = g0 + width, d0 + width
+            corners     = [self._lookup(g, d) for g, d in ((g0, d0), (g0, d1), (g1, d0), (g1, d1))]
+            Id          = np.column_stack([c[:, 2] for c in corners])
+            region      = np.column_stack([c[:, 6] for c in corners])
+            refine      = (region.min(axis=1) != region.max(axis=1))
+            if id_tol > 0:
+                refine |= (Id.max(axis=1) - Id.min(axis=1)) > id_tol
+            if not refine.any():
+                break
+            g0, d0      = g0[refine], d0[refine]
+            width     //= 2
+            gm, dm      = g0 + width, d0 + width
+            self._evaluate(np.concatenate([gm, gm, g0, g0 + 2 * width, gm]),
+                           np.concatenate([d0, d0 + 2 * width, dm, dm, dm]), T)
+            g0, d0      = np.concatenate([g0, gm, g0, gm]), np.concatenate([d0, d0, dm, dm])
+        return self.values
+
+    def run(self, T_values, Vgs_range, Vds_range):
+        blocks          = []
+        for T in T_values:
+            values      = self.run_T(T, Vgs_range, Vds_range)
+            blocks.append(np.column_stack([np.full(len(values), T), values]))
+        data            = np.concatenate(blocks)
+        return {
+                'time'  : np.zeros(len(data), dtype=np.int64) ,
+                'T'     : data[:, 0]        ,
+                'VGS'   : data[:, 1]        ,
+                'VDS'   : data[:, 2]        ,
+                'ID'    : data[:, 3]        ,
+                'CGS'   : data[:, 4]        ,
+                'CGD'   : data[:, 5]        ,
+                'CDS'   : data[:, 6]
+            }
+
+#? -------------------------------------------------------------------------------
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Benchmark.py
+#? Purpose:     Measure pymos model throughput and save the results as JSON for regression tracking
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import numpy as np
+import Params
+import Writer
+from Equations import Equations
+from LV_1_Shichman_Hodges import ShichmanHodgesModel
+from LV_13_BSIM3v3 import BSIM3v3Model
+#? -------------------------------------------------------------------------------
+MODELS          = {"shichman_hodges": ShichmanHodgesModel, "bsim3v3": BSIM3v3Model}
+GRID_SIZES      = [19, 50, 100, 200]                #! points per Vgs/Vds axis
+T_COUNTS        = [1, 5, 20]                        #! number of temperatures
+SCALAR_POINTS   = 2000                              #! scalar path is timed on a subsample
+OUTPUT_PATH     = r"D:\WORKSPACE\PyModules\10_pymos\data\benchmark.json"
+#? -------------------------------------------------------------------------------
+
+def _best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start   = time.perf_counter()
+        func()
+        best    = min(best, time.perf_counter() - start)
+    return best
+
+def _grid(n_axis, n_T):
+    T_values    = np.linspace(350.0, 450.0, n_T)
+    Vgs_values  = np.linspace(0.0, 20.0, n_axis)
+    Vds_values  = np.linspace(0.0, 800.0, n_axis)
+    return np.meshgrid(T_values, Vgs_values, Vds_values, indexing="ij")
+
+def bench_construction(repeat):
+    params  = Params.load()
+    eq      = Equations(params)
+    results = []
+    for name, cls in MODELS.items():
+        results.append({"model": name, "shared": False, "seconds": _best_of(lambda: cls(params=params), repeat)})
+        results.append({"model": name, "shared": True , "seconds": _best_of(lambda: cls(params=params, eq=eq), repeat)})
+    return results
+
+def bench_equations(repeat, n_calls=10000):
+    eq      = Equations(Params.load())
+    T       = np.linspace(350.0, 450.0, n_calls)
+    T_few   = np.resize(T[:5], n_calls).tolist()        #! sweep-like access: 5 temperatures, many calls
+    results = []
+    for label, func in [("phi"             , lambda: [eq.phi(t) for t in T_few]),
+                        ("compute_Vth"     , lambda: [eq.compute_Vth(0.0, t) for t in T_few]),
+                        ("compute_Vth_batch", lambda: eq.compute_Vth_batch(0.0, T))]:
+        seconds = _best_of(func, repeat)
+        results.append({"function": label, "calls": n_calls, "seconds": seconds, "points_per_s": n_calls / seconds})
+    return results
+
+def bench_models(repeat, grid_sizes, T_counts):
+    params  = Params.load()
+    results = []
+    for name, cls in MODELS.items():
+        model = cls(params=params)
+        for n_T in T_counts:
+            for n_axis in grid_sizes:
+                T, Vgs, Vds = _grid(n_axis, n_T)
+                points      = T.size
+                seconds     = _best_of(lambda: model.compute_batch(Vgs, Vds, 0.0, T), repeat)
+                results.append({"model": name, "path": "batch", "grid": n_axis, "temperatures": n_T,
+                                "points": points, "seconds": seconds, "points_per_s": points / seconds})
+
+                sample      = np.linspace(0, points - 1, min(points, SCALAR_POINTS)).astype(int)
+                args        = list(zip(Vgs.ravel()[sample], Vds.ravel()[sample], T.ravel()[sample]))
+                seconds     = _best_of(lambda: [model.compute(g, d, 0.0, t) for g, d, t in args], repeat)
+                results.append({"model": name, "path": "scalar", "grid": n_axis, "temperatures": n_T,
+                                "points": len(args), "seconds": seconds, "points_per_s": len(args) / seconds})
+    return results
+
+def bench_csv(repeat, grid_sizes):
+    model   = ShichmanHodgesModel(params=Params.load())
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.csv")
+        for n_axis in grid_sizes:
+            T, Vgs, Vds     = _grid(n_axis, 5)
+            Id,Cgs, Cgd, Cds = model.compute_batch(Vgs, Vds, 0.0, T)
+            chunk           = {"time": np.zeros(T.size, dtype=np.int64), "T": T.ravel(), "VGS": Vgs.ravel(), "VDS": Vds.ravel(),
+                               "ID": Id.ravel(), "CGS": Cgs.ravel(), "CGD": Cgd.ravel(), "CDS": Cds.ravel()}
+
+            def write():
+                with Writer.open_writer(path, T.size) as writer:
+                    writer.write(chunk)
+            seconds         = _best_of(write, repeat)
+            results.append({"rows": T.size, "seconds": seconds, "rows_per_s": T.size / seconds,
+                            "bytes": os.path.getsize(path)})
+    return results
+
+def run(repeat=3, grid_sizes=GRID_SIZES, T_counts=T_COUNTS):
+    return {
+        "timestamp"     : time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python"        : sys.version.split()[0],
+        "numpy"         : np.__version__,
+        "platform"      : platform.platform(),
+        "processor"     : platform.processor(),
+        "repeat"        : repeat,
+        "construction"  : bench_construction(repeat),
+        "equations"     : bench_equations(repeat),
+        "models"        : bench_models(repeat, grid_sizes, T_counts),
+        "csv_write"     : bench_csv(repeat, grid_sizes),
+    }
+
+def print_summary(report):
+    print(f"{'model':<18}{'path':<8}{'grid':>6}{'T':>4}{'points':>10}{'points/s':>14}")
+    for row in report["models"]:
+        print(f"{row['model']:<18}{row['path']:<8}{row['grid']:>6}{row['temperatures']:>4}{row['points']:>10}{row['points_per_s']:>14.3e}")
+    for row in report["construction"]:
+        print(f"construct {row['model']:<18} shared_eq={row['shared']!s:<6} {row['seconds'] * 1e6:10.1f} us")
+    for row in report["csv_write"]:
+        print(f"csv write {row['rows']:>9} rows {row['rows_per_s']:12.3e} rows/s {row['bytes']:>12} bytes")
+
+#? -------------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pymos models")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="JSON file to write the results to")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions, the best one is kept")
+    parser.add_argument("--quick", action="store_true", help="only the two smallest grids and one temperature count")
+    args    = parser.parse_args()
+    report  = run(args.repeat, GRID_SIZES[:2] if args.quick else GRID_SIZES, T_COUNTS[:1] if args.quick else T_COUNTS)
+    print_summary(report)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to: {args.output}")
+#? -------------------------------------------------------------------------------
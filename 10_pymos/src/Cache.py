@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Cache.py
+#? Purpose:     Content-addressed sweep result cache, only missing operating points are recomputed
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+import sys
+import json
+import numbers
+import hashlib
+import inspect
+import numpy as np
+import pandas as pd
+import Registry
+import Profile
+from Sweep import SweepEngine, evaluate_chunk
+#? -------------------------------------------------------------------------------
+
+CACHE_DIR   = r"D:\WORKSPACE\PyModules\10_pymos\data\cache"
+OUTPUTS     = ("ID", "CGS", "CGD", "CDS")
+DTYPE       = np.dtype([(name, np.float64) for name in ("T", "VGS", "VDS") + OUTPUTS])
+
+#? -------------------------------------------------------------------------------
+
+def _module_source(obj):
+    module = sys.modules.get(type(obj).__module__)
+    try:
+        return inspect.getsource(module)
+    except (OSError, TypeError):
+        return ""
+
+def _hash_attributes(digest, obj, prefix=""):
+    for name, value in sorted(vars(obj).items()):
+        if name.startswith("_"):                         #! caches and derived lookup rows
+            continue
+        name = prefix + name
+        if isinstance(value, np.ndarray):
+            digest.update(name.encode() + str(value.shape).encode() + np.ascontiguousarray(value, dtype=float).tobytes())
+        elif isinstance(value, (numbers.Number, str)):
+            digest.update(f"{name}={value!r}".encode())
+        elif isinstance(value, dict):
+            digest.update(name.encode() + json.dumps(value, sort_keys=True, default=lambda v: np.asarray(v).tolist()).encode())
+        elif hasattr(value, "to_dict"):
+            entries = {key: np.asarray(entry["VALUE"]).tolist() for key, entry in value.to_dict().items()}
+            digest.update(name.encode() + json.dumps(entries, sort_keys=True).encode())
+
+def model_key(model, Vsb=0.0):
+    """
+    Hash of everything a sweep result depends on: the model class and the
+    source of its module (and of its Equations module), every public numeric,
+    string, dict, array or parameter-set attribute of the instance and of its
+    Equations, and Vsb. Editing the model code or any parameter (including
+    eq.update_parameters()) therefore selects a different cache file.
+    """
+    digest          = hashlib.sha256()
+    digest.update(f"{type(model).__module__}.{type(model).__qualname__}".encode())
+    digest.update(_module_source(model).encode())
+    if hasattr(model, "eq"):
+        digest.update(_module_source(model.eq).encode())
+    _hash_attributes(digest, model)
+    if hasattr(model, "eq"):
+        _hash_attributes(digest, model.eq, "eq.")         #! update_parameters() changes eq, not the model
+    digest.update(repr(float(Vsb)).encode())
+    return digest.hexdigest()[:32]
+
+#? -------------------------------------------------------------------------------
+
+class CachedSweep:
+    """
+    Drop-in replacement for SweepEngine.run() that keeps every computed
+    (T, Vgs, Vds) -> (Id, Cgs, Cgd, Cds) row in CACHE_DIR/<model_key>.npy.
+    A rerun looks every grid point up in that file and evaluates only the
+    missing ones, so extending a grid or returning to an earlier parameter
+    set costs only the new points. Changing the model or its parameters
+    changes the key, which invalidates every stored point at once.
+    Points are matched on their exact float values. For charge-only models
+    (CHARGES) the stored capacitances are those differentiated over the grid
+    a point was first computed on.
+    """
+    def __init__(self, model, cache_dir=CACHE_DIR, chunk_size=65536, workers=None):
+        self.model          = Registry.resolve(model)
+        self.cache_dir      = cache_dir
+        self.engine         = SweepEngine(self.model, chunk_size=chunk_size, workers=workers)
+        self.hits           = 0
+        self.misses         = 0
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def load(self, key):
+        path = self.path(key)
+        return np.load(path) if os.path.exists(path) else np.empty(0, dtype=DTYPE)
+
+    def store(self, key, stored, new_rows):
+        if not new_rows:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path    = self.path(key) + ".tmp"
+        with open(tmp_path, "wb") as f:                     #! np.save would append .npy to the tmp name
+            np.save(f, np.concatenate([stored] + new_rows))
+        os.replace(tmp_path, self.path(key))                #! an interrupted run keeps the old cache
+
+    @staticmethod
+    def _rows(chunk, mask=slice(None)):
+        rows        = np.empty(len(chunk["ID"][mask]), dtype=DTYPE)
+        for name in DTYPE.names:
+            rows[name] = chunk[name][mask]
+        return rows
+
+    def run(self, T_values, Vgs_values, Vds_values, Vsb=0.0):
+        with Profile.timer("cache.load"):
+            key         = model_key(self.model, Vsb)
+            stored      = self.load(key)
+        new_rows        = []
+        total_points    = len(T_values) * len(Vgs_values) * len(Vds_values)
+        if stored.size == 0:
+            for chunk in self.engine.run(T_values, Vgs_values, Vds_values, Vsb):
+                self.misses += len(chunk["ID"])
+                Profile.hit("sweep.cache", False, len(chunk["ID"]))
+                new_rows.append(self._rows(chunk))
+                yield chunk
+            with Profile.timer("cache.store"):
+                self.store(key, stored, new_rows)
+            return
+
+        index           = pd.MultiIndex.from_arrays([stored["T"], stored["VGS"], stored["VDS"]])
+        unique          = ~index.duplicated()                   #! grids with repeated values store repeated rows
+        stored, index   = stored[unique], index[unique]
+        axes            = (np.asarray(T_values), np.asarray(Vgs_values, dtype=float), np.asarray(Vds_values, dtype=float))
+        shape           = tuple(len(axis) for axis in axes)
+        for start, stop in self.engine.chunks(total_points):
+            points      = np.arange(start, stop)
+            iT, iVgs, iVds = np.unravel_index(points, shape)
+            T, Vgs, Vds = axes[0][iT], axes[1][iVgs], axes[2][iVds]
+            found       = index.get_indexer(pd.MultiIndex.from_arrays([T.astype(float), Vgs, Vds]))
+            missing     = found < 0
+            chunk       = {'time': points // total_points, 'T': T, 'VGS': Vgs, 'VDS': Vds}
+            for name in OUTPUTS:
+                chunk[name] = stored[name][found]
+            if missing.any() and self.model.CHARGES:    #! capacitances need the neighbouring grid rows
+                with Profile.timer("sweep.model"):
+                    computed = evaluate_chunk(self.model, axes, Vsb, start, stop)
+                for name, values in zip(OUTPUTS, computed):
+                    chunk[name][missing] = values[missing]
+            elif missing.any():
+                with Profile.timer("sweep.model"):
+                    computed = self.model.compute_batch(Vgs=Vgs[missing], Vds=Vds[missing], Vsb=Vsb, T=T[missing])
+                for name, values in zip(OUTPUTS, computed):
+                    chunk[name][missing] = values
+            if missing.any():
+                new_rows.append(self._rows(chunk, missing))
+            self.hits  += int((~missing).sum())
+            self.misses += int(missing.sum())
+            Profile.hit("sweep.cache", True, int((~missing).sum()))
+            Profile.hit("sweep.cache", False, int(missing.sum()))
+            yield chunk
+        with Profile.timer("cache.store"):
+            self.store(key, stored, new_rows)
+
+#? -------------------------------------------------------------------------------
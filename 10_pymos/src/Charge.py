@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Charge.py
+#? Purpose:     Cgs, Cgd and Cds from the terminal charges (Qg, Qd) of a model over a sweep grid
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import numpy as np
+#? -------------------------------------------------------------------------------
+#?
+#?  Source and body move together (Vsb fixed), so with V = (Vgs, Vds):
+#?
+#?      Cgs = -dQg/dVs =  dQg/dVgs + dQg/dVds
+#?      Cgd = -dQg/dVd = -dQg/dVds
+#?      Cds = -dQd/dVs =  dQd/dVgs + dQd/dVds
+#?
+#? -------------------------------------------------------------------------------
+
+def _capacitances(dQg_dVgs, dQg_dVds, dQd_dVgs, dQd_dVds):
+    return dQg_dVgs + dQg_dVds, -dQg_dVds, dQd_dVgs + dQd_dVds
+
+def _gradient(Q, x, axis):
+    """
+    dQ/dx along axis: the second-order three-point formula for non-uniform
+    spacing inside, one-sided first order at the ends. Written out rather
+    than np.gradient, which switches formula when a slab happens to look
+    uniformly spaced, so a chunk would not reproduce the full-grid values.
+    """
+    Q               = np.moveaxis(Q, axis, -1)
+    dQ              = np.zeros(Q.shape)
+    if len(x) < 2:
+        return np.moveaxis(dQ, -1, axis)
+    h1 , h2         = x[1:-1] - x[:-2], x[2:] - x[1:-1]
+    dQ[..., 1:-1]   = (-h2 / (h1 * (h1 + h2)) * Q[..., :-2] + (h2 - h1) / (h1 * h2) * Q[..., 1:-1]
+                       + h1 / (h2 * (h1 + h2)) * Q[..., 2:])
+    dQ[..., 0]      = (Q[..., 1] - Q[..., 0]) / (x[1] - x[0])
+    dQ[..., -1]     = (Q[..., -1] - Q[..., -2]) / (x[-1] - x[-2])
+    return np.moveaxis(dQ, -1, axis)
+
+def capacitance_grid(Qg, Qd, Vgs_values, Vds_values):
+    """
+    Cgs, Cgd, Cds from charges sampled on a (..., Vgs, Vds) grid, by
+    differentiating along the last two axes (second order inside, one-sided
+    at the grid edges). The axes must be strictly increasing.
+    """
+    Vgs_values      = np.asarray(Vgs_values, dtype=float)
+    Vds_values      = np.asarray(Vds_values, dtype=float)
+    return _capacitances(_gradient(Qg, Vgs_values, -2), _gradient(Qg, Vds_values, -1),
+                         _gradient(Qd, Vgs_values, -2), _gradient(Qd, Vds_values, -1))
+
+def grid_capacitances(model, T_values, Vgs_values, Vds_values, Vsb, start, stop):
+    """
+    Cgs, Cgd, Cds for the flat points [start, stop) of the T x Vgs x Vds grid
+    (Vds innermost). Charges are evaluated once on the whole Vgs rows the
+    points fall in, plus one neighbouring row on each side, so every point
+    gets the same value as if the full grid had been differentiated at once.
+    The charges must be smooth over the grid, as in the Verilog-A compact
+    models: differences across a region kink would smear it over a whole
+    grid step, so piecewise models return closed-form capacitances instead.
+    """
+    nG , nD         = len(Vgs_values), len(Vds_values)
+    first , last    = start // nD, (stop - 1) // nD             #! (T, Vgs) rows touched
+    out             = np.empty((3, last - first + 1, nD))
+    for iT in range(first // nG, last // nG + 1):
+        a           = max(first, iT * nG) - iT * nG             #! rows of this T inside the chunk
+        b           = min(last, iT * nG + nG - 1) - iT * nG
+        lo , hi     = max(a - 1, 0), min(b + 2, nG)             #! plus the halo rows
+        Vgs , Vds   = np.meshgrid(Vgs_values[lo:hi], Vds_values, indexing="ij")
+        Qg , Qd     = model.compute_charges(Vgs, Vds, Vsb, T_values[iT])
+        C           = capacitance_grid(Qg, Qd, Vgs_values[lo:hi], Vds_values)
+        rows        = slice(iT * nG + a - first, iT * nG + b - first + 1)
+        out[:, rows] = np.stack(C)[:, a - lo:b - lo + 1]
+    out             = out.reshape(3, -1)[:, start - first * nD:stop - first * nD]
+    return out[0], out[1], out[2]
+
+#? -------------------------------------------------------------------------------
@@ -18,53 +18,110 @@
 #? Licence:     Refer to the LICENSE file
 #? -------------------------------------------------------------------------------
 
-import Log 
+import Params
+import Profile
 import numpy as np
+from collections import OrderedDict
+
+#? -------------------------------------------------------------------------------
+
+def at(value, shape, mask):
+    """Parameter value at the masked points; parameters may be scalars or arrays broadcastable to shape."""
+    if np.ndim(value) == 0:
+        return value
+    return np.broadcast_to(value, shape)[mask]
+
+#? -------------------------------------------------------------------------------
+
+ATTRIBUTES = {"TOX": "tox", "GAMMA": "Gamma"}     #! vars.json name -> Equations attribute, where they differ
 
 #? -------------------------------------------------------------------------------
 
 class Equations:
-    def __init__(self):
-        self.logger     = Log.Logger()
-        self.params     = self.logger.load_parameters()
-        self.q          = self.params["q"]["VALUE"]
-        self.k          = self.params["k"]["VALUE"]
-        self.eps_ox     = self.params["eps_ox"]["VALUE"]
-        self.eps_sic    = self.params["eps_sic"]["VALUE"]
-        self.Nsurf      = self.params["Nsurf"]["VALUE"]
-        self.VFB        = self.params["VFB"]["VALUE"]
-        self.Vsurf      = self.params["Vsurf"]["VALUE"]
-        self.mjsurf     = self.params["mjsurf"]["VALUE"]
-        self.ni         = self.params["ni"]["VALUE"]
-        self.PPW        = self.params["PPW"]["VALUE"]
-        self.tox        = self.params["TOX"]["VALUE"]
-        self.mu         = self.params["mu"]["VALUE"]
-        self.NJFET      = self.params["NJFET"]["VALUE"]
-        self.H_by_eff   = self.params["H_by_eff"]["VALUE"]
-        self.XJPW       = self.params["XJPW"]["VALUE"]
-        self.dpw        = self.params["dpw"]["VALUE"]
-        self.mj         = self.params["mj"]["VALUE"]
-        self.Gamma      = self.params["GAMMA"]["VALUE"]
+    PARAMETERS = (  "q"         , "k"         , "eps_ox"    , "eps_sic"   , "Nsurf"     ,
+                    "VFB"       , "Vsurf"     , "mjsurf"    , "ni"        , "PPW"       ,
+                    "TOX"       , "mu"        , "NJFET"     , "H_by_eff"  , "XJPW"      ,
+                    "dpw"       , "mj"        , "GAMMA"     , "C_overlap" , "CJ0"       ,
+                    "m"         )
+
+    def __init__(self, params=None, cache_size=256):
+        self.params     = params if params is not None else Params.load()
+        self.q          = self.params.q
+        self.k          = self.params.k
+        self.eps_ox     = self.params.eps_ox
+        self.eps_sic    = self.params.eps_sic
+        self.Nsurf      = self.params.Nsurf
+        self.VFB        = self.params.VFB
+        self.Vsurf      = self.params.Vsurf
+        self.mjsurf     = self.params.mjsurf
+        self.ni         = self.params.ni
+        self.PPW        = self.params.PPW
+        self.tox        = self.params.TOX
+        self.mu         = self.params.mu
+        self.NJFET      = self.params.NJFET
+        self.H_by_eff   = self.params.H_by_eff
+        self.XJPW       = self.params.XJPW
+        self.dpw        = self.params.dpw
+        self.mj         = self.params.mj
+        self.Gamma      = self.params.GAMMA
+        self.C_overlap  = self.params.C_overlap
+        self.CJ0        = self.params.CJ0
+        self.m          = self.params.m
+        self.cache_size = cache_size
+        self._cache     = OrderedDict()     #! (name, T[, Vsb]) -> value, least recently used first
+#? -------------------------------------------------------------------------------
+
+    def _cached(self, key, func):
+        if key in self._cache:
+            if Profile.ENABLED:
+                Profile.hit("equations.cache", True)
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if Profile.ENABLED:
+            Profile.hit("equations.cache", False)
+        value           = func()
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def invalidate_cache(self):
+        self._cache.clear()
+
+    def update_parameters(self, **values):
+        """Set parameters by their vars.json names (see PARAMETERS); self.params follows and the cache is cleared."""
+        for name in values:
+            if name not in self.PARAMETERS:
+                raise AttributeError(f"Unknown parameter: {name}")
+        self.params     = self.params.replace(**values)
+        for name, value in values.items():
+            setattr(self, ATTRIBUTES.get(name, name), value)
+        self.invalidate_cache()
 #? -------------------------------------------------------------------------------
 
     def phi_t(self, T):
         return (self.k * T) / self.q
 
     def phi(self, T):
+        if isinstance(T, np.ndarray):
+            return self._phi(T)
+        return self._cached(("phi", T), lambda: self._phi(T))
+
+    def _phi(self, T):
         return self.phi_t(T) * np.log(self.NJFET * self.PPW / (np.square(self.ni)))
 
     def alpha(self):
-        return np.sqrt((2 * self.eps_sic * self.PPW) / (self.q * self.NJFET * (self.NJFET + self.PPW)))
+        return self._cached(("alpha",), lambda: np.sqrt((2 * self.eps_sic * self.PPW) / (self.q * self.NJFET * (self.NJFET + self.PPW))))
 
     def VTO_func(self, T):
-        return float(self.phi(T) - np.square(self.dpw / (2 * self.alpha())))
+        return self._cached(("VTO", T), lambda: float(self.phi(T) - np.square(self.dpw / (2 * self.alpha()))))
 
     def rho(self):
         return 1 / (self.q * self.NJFET * self.mu)
 
     def beta_func(self, T):
-        return float(((2 * self.H_by_eff) / (self.XJPW * self.rho() * (-self.VTO_func(T)))) *
-                     ((self.dpw / 2) - self.alpha() * np.sqrt(self.phi(T))))
+        return self._cached(("beta", T), lambda: float(((2 * self.H_by_eff) / (self.XJPW * self.rho() * (-self.VTO_func(T)))) *
+                                                       ((self.dpw / 2) - self.alpha() * np.sqrt(self.phi(T)))))
 
     def COX(self):
         return self.eps_ox / self.tox
@@ -82,13 +139,103 @@ class Equations:
 #? -------------------------------------------------------------------------------
 
     def compute_Vth(self, Vsb,T):
+        return self._cached(("Vth", T, Vsb), lambda: self._compute_Vth(Vsb,T))
+
+    def _compute_Vth(self, Vsb,T):
         # vbi             = self.VTO_func(T) - self.Gamma *   np.sqrt(self.phi(T)) 
         vbi             = self.VFB + self.phi(T)
-        print(self.phi(T), vbi)
         if      Vsb < 0 :
                 vth     = vbi + self.Gamma * ( np.sqrt(self.phi(T)) + 1/2 * (Vsb/np.sqrt(self.phi(T))))
         elif    Vsb >= 0:
                 vth     = vbi + self.Gamma *   np.sqrt( self.phi(T)+ Vsb)
         return  vth
-    
+
+    def compute_Vth_batch(self, Vsb, T):
+        phi             = self.phi(np.asarray(T, dtype=float))
+        vbi             = self.VFB + phi
+        Vsb, phi, vbi, gamma = np.broadcast_arrays(np.asarray(Vsb, dtype=float), phi, vbi, np.asarray(self.Gamma, dtype=float))
+        vth             = np.empty(vbi.shape)
+        neg             = Vsb < 0                   #! masked form of the Vsb < 0 / Vsb >= 0 branches
+        pos             = ~neg
+        vth[neg]        = vbi[neg] + gamma[neg] * ( np.sqrt(phi[neg]) + 1/2 * (Vsb[neg]/np.sqrt(phi[neg])))
+        vth[pos]        = vbi[pos] + gamma[pos] *   np.sqrt( phi[pos]+ Vsb[pos])
+        return  vth
+
+    def compute_dVth_dVsb_batch(self, Vsb, T):
+        phi             = self.phi(np.asarray(T, dtype=float))
+        Vsb, phi, gamma = np.broadcast_arrays(np.asarray(Vsb, dtype=float), phi, np.asarray(self.Gamma, dtype=float))
+        dvth            = np.empty(phi.shape)
+        neg             = Vsb < 0
+        pos             = ~neg
+        dvth[neg]       = gamma[neg] * 1/2 / np.sqrt(phi[neg])                #! linearized branch, matches at Vsb = 0
+        dvth[pos]       = gamma[pos] / (2 * np.sqrt( phi[pos]+ Vsb[pos]))
+        return  dvth
+
+#? -------------------------------------------------------------------------------
+
+    def compute_charges_batch(self, Vgs, Vds, Vsb, T, C_ox):
+        """
+        Meyer terminal charges (Qg, Qd). Qg is the long-channel inversion
+        charge under the gate, C_ox * (Vsat - Vds/2 + Vds^2 / (12 (Vsat - Vds/2)))
+        in linear and 2/3 C_ox Vsat in saturation (continuous at Vds = Vsat),
+        plus the gate-source and gate-drain overlap C_overlap * (Vgs + Vgd).
+        Qd is the drain-body junction charge, Cj = CJ0 / (1 + Vdb/phi)^m,
+        linearized below Vdb = -phi/2; the channel charge is not partitioned
+        to the drain (Meyer). Cgs = -dQg/dVs, Cgd = -dQg/dVd, Cds = -dQd/dVs.
+        """
+        Vth             = self.compute_Vth_batch(Vsb,T)
+        phi             = self.phi(np.asarray(T, dtype=float))
+        Vgs , Vds , Vsb , Vth , phi , C_ox , C_ov , CJ0 , m = np.broadcast_arrays(
+                            *(np.asarray(v, dtype=float) for v in (Vgs, Vds, Vsb, Vth, phi, C_ox, self.C_overlap, self.CJ0, self.m)))
+        Vsat            = Vgs - Vth
+        linear          = (Vsat > 0) & (Vsat >= Vds)    #! vds <= vgs-Vth
+        saturation      = (Vsat > 0) & (Vsat <  Vds)    #! Vds >= Vgs - Vth
+
+        Qg              = np.zeros(Vsat.shape)          #! cutoff: no inversion charge
+        vds , vsat      = Vds[linear] , Vsat[linear]
+        Qg[linear]      = C_ox[linear] * (vsat - vds/2 + np.square(vds) / (12 * (vsat - vds/2)))
+        Qg[saturation]  = 2/3 * C_ox[saturation] * Vsat[saturation]
+        Qg             += C_ov * (2 * Vgs - Vds)
+
+        Vdb             = Vds + Vsb
+        knee            = -phi / 2                      #! forward-bias limit of the depletion formula
+        V               = np.maximum(Vdb, knee)
+        Qd              = CJ0 * phi / (1 - m) * (np.power(1 + V / phi, 1 - m) - 1)
+        Qd             += CJ0 * np.power(1 + knee / phi, -m) * np.minimum(Vdb - knee, 0.0)
+        return Qg, Qd
+
+    def compute_capacitances_batch(self, Vgs, Vds, Vsb, T, C_ox):
+        """
+        Cgs, Cgd and Cds as the closed-form derivatives of
+        compute_charges_batch(), in one masked pass. With u = Vsat - Vds/2 the
+        linear region gives Cgs, Cgd = C_ox * ((1 - Vds^2/(12 u^2))/2 +- Vds/(6 u)),
+        saturation Cgs = 2/3 C_ox and Cgd = 0, cutoff none; both get the
+        overlap C_overlap. Cds is the junction capacitance Cj(Vdb).
+        Scalar Vsb and T use the cached Vth and phi, so scalar compute()
+        calls share this path at little cost.
+        """
+        if isinstance(Vsb, np.ndarray) or isinstance(T, np.ndarray):
+            Vth , phi   = self.compute_Vth_batch(Vsb,T), self.phi(np.asarray(T, dtype=float))
+        else:
+            Vth , phi   = self.compute_Vth(Vsb,T), self.phi(T)
+        Vgs , Vds , Vth , C_ox , C_ov = np.broadcast_arrays(np.asarray(Vgs, dtype=float), np.asarray(Vds, dtype=float),
+                                                           np.asarray(Vth, dtype=float), np.asarray(C_ox, dtype=float),
+                                                           np.asarray(self.C_overlap, dtype=float))
+        Vsat            = Vgs - Vth
+        linear          = (Vsat > 0) & (Vsat >= Vds)    #! vds <= vgs-Vth
+        saturation      = (Vsat > 0) & (Vsat <  Vds)    #! Vds >= Vgs - Vth
+
+        Cgs             = C_ov.copy()                   #! cutoff: overlap only
+        Cgd             = C_ov.copy()
+        vds , u , c     = Vds[linear] , Vsat[linear] - Vds[linear]/2 , C_ox[linear]
+        even , odd      = (1 - np.square(vds) / (12 * np.square(u))) / 2, vds / (6 * u)
+        Cgs[linear]    += c * (even + odd)
+        Cgd[linear]    += c * (even - odd)
+        Cgs[saturation] += 2/3 * C_ox[saturation]
+
+        Vdb             = Vds + Vsb
+        knee            = -np.asarray(phi) / 2          #! forward-bias limit of the depletion formula
+        Cds             = self.CJ0 * np.power(1 + np.maximum(Vdb, knee) / phi, -self.m)
+        return Cgs, Cgd, np.broadcast_to(Cds, Vsat.shape)
+
 #? -------------------------------------------------------------------------------
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Fit.py
+#? Purpose:     Calibrate vars.json parameters against measured Id(Vgs, Vds, T) data by least squares
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import Params
+import Writer
+#? -------------------------------------------------------------------------------
+
+_FITTER = {}    #! per-process fitter, set by _init_worker()
+
+def _init_worker(fitter):
+    _FITTER["fitter"] = fitter
+
+def _fit_from(x0):
+    return _FITTER["fitter"].fit(x0=x0)
+
+#? -------------------------------------------------------------------------------
+
+class ModelFitter:
+    """
+    Levenberg-Marquardt fit of the vars.json parameters listed in names.
+
+    Every evaluation builds one model whose selected parameters are (K, 1)
+    arrays, so K candidate parameter vectors are evaluated against all N
+    measured points in a single compute_current() call. The forward-difference
+    Jacobian (P + 1 vectors) and the trial steps of each iteration are each
+    one such call.
+
+    Parameters are optimized relative to their starting value (x = p / |p0|).
+    Residuals are (Id_model - Id_meas) / (|Id_meas| + floor) with
+    floor = rel_floor * max|Id_meas|, which balances low and high currents.
+    bounds maps a name to (low, high) in physical units.
+    """
+    def __init__(self, model_cls, T, Vgs, Vds, Id, names, params=None, bounds=None, rel_floor=1e-3, Vsb=0.0):
+        self.model_cls  = model_cls
+        self.params     = params if params is not None else Params.load()
+        self.names      = list(names)
+        self.T          = np.asarray(T, dtype=float)
+        self.Vgs        = np.asarray(Vgs, dtype=float)
+        self.Vds        = np.asarray(Vds, dtype=float)
+        self.Id         = np.asarray(Id, dtype=float)
+        self.Vsb        = Vsb
+        p0              = np.array([getattr(self.params, name) for name in self.names], dtype=float)
+        self.scale      = np.where(p0 != 0, np.abs(p0), 1.0)
+        self.x_init     = p0 / self.scale
+        self.weight     = 1 / (np.abs(self.Id) + rel_floor * np.abs(self.Id).max())
+        self.lower      = np.full(len(self.names), -np.inf)
+        self.upper      = np.full(len(self.names),  np.inf)
+        for i, name in enumerate(self.names):
+            if bounds and name in bounds:
+                self.lower[i], self.upper[i] = np.asarray(bounds[name], dtype=float) / self.scale[i]
+
+    @classmethod
+    def from_csv(cls, model_cls, path, names, **kwargs):
+        df = Writer.read_results(path)
+        return cls(model_cls, df["T"].to_numpy(), df["VGS"].to_numpy(), df["VDS"].to_numpy(), df["ID"].to_numpy(), names, **kwargs)
+
+    def parameters(self, x):
+        return self.params.replace(**{name: float(v) for name, v in zip(self.names, np.asarray(x) * self.scale)})
+
+    def residuals(self, X):
+        """Weighted residuals for K parameter vectors X (K, P) -> (K, N)."""
+        X               = np.atleast_2d(X) * self.scale
+        params          = self.params.replace(**{name: X[:, [i]] for i, name in enumerate(self.names)})
+        Id              = self.model_cls(params=params).compute_current(self.Vgs, self.Vds, self.Vsb, self.T)
+        return (np.broadcast_to(Id, (X.shape[0], self.Id.size)) - self.Id) * self.weight
+
+    def fit(self, x0=None, max_iter=100, ftol=1e-12, xtol=1e-10, damping=1e-3):
+        x               = np.clip(self.x_init if x0 is None else np.asarray(x0, dtype=float), self.lower, self.upper)
+        n               = x.size
+        r               = self.residuals(x)[0]
+        cost            = 0.5 * r @ r
+        it              = 0
+        for it in range(1, max_iter + 1):
+            h           = 1e-7 * np.maximum(1.0, np.abs(x))
+            probes      = np.vstack([x, x + np.diag(h)])
+            R           = self.residuals(probes)
+            J           = ((R[1:] - R[0]) / h[:, None]).T               #! (N, P)
+            A           = J.T @ J
+            g           = J.T @ r
+            diag        = np.maximum(np.diag(A), 1e-30)
+            lambdas     = damping * np.array([0.1, 1.0, 10.0])         #! three damping levels tried in one call
+            steps       = np.array([np.linalg.solve(A + lam * np.diag(diag), -g) for lam in lambdas])
+            trials      = np.clip(x + steps, self.lower, self.upper)
+            costs       = 0.5 * np.sum(self.residuals(trials) ** 2, axis=1)
+            best        = int(np.argmin(costs))
+            if not costs[best] < cost:
+                damping *= 100.0
+                if damping > 1e12:
+                    break
+                continue
+            dx          = trials[best] - x
+            improvement = cost - costs[best]
+            x, cost     = trials[best], costs[best]
+            damping     = max(lambdas[best] / 3.0, 1e-12)
+            r           = self.residuals(x)[0]
+            if improvement <= ftol * max(cost, 1e-300) or np.all(np.abs(dx) <= xtol * (np.abs(x) + xtol)):
+                break
+        p               = x * self.scale
+        return {"params": self.parameters(x), "values": dict(zip(self.names, p.tolist())), "x": x,
+                "cost": float(cost), "rms": float(np.sqrt(2 * cost / r.size)), "iterations": it}
+
+    def fit_multistart(self, n_starts=8, spread=3.0, workers=None, seed=0, **kwargs):
+        """
+        Start from x_init plus n_starts - 1 points drawn log-uniformly within
+        a factor spread of it (clipped to bounds) and keep the lowest cost.
+        Starts run in parallel worker processes when workers != 1.
+        """
+        rng             = np.random.default_rng(seed)
+        factors         = np.exp(rng.uniform(-np.log(spread), np.log(spread), size=(n_starts - 1, self.x_init.size)))
+        starts          = np.vstack([self.x_init, self.x_init * factors])
+        starts          = np.clip(starts, self.lower, self.upper)
+        workers         = min(workers or os.cpu_count() or 1, n_starts)
+        if workers <= 1 or kwargs:
+            results     = [self.fit(x0=x0, **kwargs) for x0 in starts]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_fit_from, starts))
+        best            = min(results, key=lambda result: result["cost"])
+        best["starts"]  = [result["cost"] for result in results]
+        return best
+
+#? -------------------------------------------------------------------------------
+if __name__ == "__main__":
+    from LV_1_Shichman_Hodges import ShichmanHodgesModel
+    MEASURED_PATH       = r"D:\WORKSPACE\PyModules\10_pymos\data\shichman_hodges.csv"
+    FITTED_PATH         = r"D:\WORKSPACE\PyModules\10_pymos\data\vars_fitted.json"
+    fitter              = ModelFitter.from_csv(ShichmanHodgesModel, MEASURED_PATH, ["lambda_", "GAMMA", "VFB"])
+    result              = fitter.fit_multistart(n_starts=8)
+    print("-------------------------------------------------------")
+    for name, value in result["values"].items():
+        print(f"{name:<10} = {value:.6e}")
+    print(f"rms rel. residual = {result['rms']:.3e} after {result['iterations']} iterations")
+    print("-------------------------------------------------------")
+    result["params"].save(FITTED_PATH)
+#? -------------------------------------------------------------------------------
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        LUT.py
+#? Purpose:     Lookup-table device model tabulated from an existing model, served by trilinear interpolation
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+import numpy as np
+import Registry
+from Registry import DeviceModel
+from Sweep import evaluate_chunk
+from Cache import model_key
+#? -------------------------------------------------------------------------------
+
+LUT_PATH    = r"D:\WORKSPACE\PyModules\10_pymos\data\lut.npz"
+LUT_SOURCE  = "bsim3v3"                        #! registry name of the model tabulated by from_params()
+LUT_T       = np.arange(300.0, 501.0, 25.0)
+LUT_VGS     = np.linspace(0.0, 20.0, 81)
+LUT_VDS     = np.linspace(0.0, 800.0, 161)
+
+#? -------------------------------------------------------------------------------
+
+class _Axis:
+    def __init__(self, values):
+        self.values     = np.asarray(values, dtype=float)
+        if self.values.ndim != 1 or self.values.size == 0 or np.any(np.diff(self.values) <= 0):
+            raise ValueError("LUT axes must be non-empty and strictly increasing")
+        steps           = np.diff(self.values)
+        self.uniform    = self.values.size > 1 and np.allclose(steps, steps[0], rtol=1e-12, atol=0.0)
+
+    def locate(self, x):
+        """Lower cell index and weight of the upper node, clamped to the table range."""
+        n               = self.values.size
+        if n == 1:
+            return np.zeros(np.shape(x), dtype=np.intp), np.zeros(np.shape(x))
+        if self.uniform:
+            step        = self.values[1] - self.values[0]
+            i           = np.floor((x - self.values[0]) / step).astype(np.intp)
+        else:
+            i           = np.searchsorted(self.values, x, side="right") - 1
+        i               = np.clip(i, 0, n - 2)
+        x0, x1          = self.values[i], self.values[i + 1]
+        return i, np.clip((x - x0) / (x1 - x0), 0.0, 1.0)
+
+#? -------------------------------------------------------------------------------
+
+class LUTModel(DeviceModel):
+    """
+    Id, Cgs, Cgd and Cds tabulated on a (T, Vgs, Vds) grid at one fixed Vsb.
+    Queries outside the grid are clamped to its edges. compute() and
+    compute_batch() have the same signature as the analytic models, so a
+    LUTModel can be dropped into the sweep engine or any caller of those.
+    """
+    VSB_DEPENDENT = False
+
+    def __init__(self, T_values, Vgs_values, Vds_values, tables, Vsb=0.0, source="", key=""):
+        self.T_axis     = _Axis(T_values)
+        self.Vgs_axis   = _Axis(Vgs_values)
+        self.Vds_axis   = _Axis(Vds_values)
+        self.tables     = np.asarray(tables, dtype=float)     #! (4, nT, nVgs, nVds): Id, Cgs, Cgd, Cds
+        self.Vsb        = float(Vsb)
+        self.source     = source
+        self.key        = key                                   #! Cache.model_key of the tabulated model
+        expected        = (4, self.T_axis.values.size, self.Vgs_axis.values.size, self.Vds_axis.values.size)
+        if self.tables.shape != expected:
+            raise ValueError(f"LUT tables have shape {self.tables.shape}, expected {expected}")
+        self._rows      = np.ascontiguousarray(self.tables.reshape(4, -1).T)   #! one row of 4 outputs per grid node
+
+    @classmethod
+    def build(cls, model, T_values, Vgs_values, Vds_values, Vsb=0.0):
+        axes            = tuple(np.asarray(v, dtype=float) for v in (T_values, Vgs_values, Vds_values))
+        shape           = tuple(len(axis) for axis in axes)
+        tables          = np.stack(evaluate_chunk(model, axes, Vsb, 0, shape[0] * shape[1] * shape[2])).reshape((4,) + shape)
+        return cls(T_values, Vgs_values, Vds_values, tables, Vsb=Vsb, source=type(model).__name__, key=model_key(model, Vsb))
+
+    @classmethod
+    def from_params(cls, params=None, eq=None, path=LUT_PATH, source=LUT_SOURCE, Vsb=0.0):
+        """
+        Table of the registered model source (built from params and eq) on
+        the LUT_* axes at Vsb. The table saved at path is reused when it was
+        built from the same model, parameters, axes and Vsb; otherwise the
+        model is tabulated again and saved there.
+        """
+        model           = Registry.create(source, params=params, eq=eq)
+        if os.path.exists(path):
+            lut         = cls.load(path)
+            axes        = (lut.T_axis.values, lut.Vgs_axis.values, lut.Vds_axis.values)
+            if lut.key == model_key(model, Vsb) and all(np.array_equal(a, b) for a, b in zip(axes, (LUT_T, LUT_VGS, LUT_VDS))):
+                return lut
+        lut             = cls.build(model, LUT_T, LUT_VGS, LUT_VDS, Vsb=Vsb)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        lut.save(path)
+        return lut
+
+    def compute_batch(self, Vgs, Vds, Vsb=0.0, T=350):
+        if np.any(np.asarray(Vsb) != self.Vsb):
+            raise ValueError(f"LUT was tabulated at Vsb={self.Vsb}, got Vsb={Vsb}")
+        Vgs, Vds, T     = np.broadcast_arrays(np.asarray(Vgs, dtype=float), np.asarray(Vds, dtype=float), np.asarray(T, dtype=float))
+        iT , wT         = self.T_axis.locate(T)
+        iG , wG         = self.Vgs_axis.locate(Vgs)
+        iD , wD         = self.Vds_axis.locate(Vds)
+        _, nT, nG, nD   = self.tables.shape
+        result          = np.zeros(Vgs.shape + (4,))
+        for dT, fT in ((0, 1 - wT), (1, wT)):           #! 8 corners of the enclosing cell
+            jT          = np.minimum(iT + dT, nT - 1) * nG
+            for dG, fG in ((0, 1 - wG), (1, wG)):
+                jG      = (jT + np.minimum(iG + dG, nG - 1)) * nD
+                fTG     = fT * fG
+                for dD, fD in ((0, 1 - wD), (1, wD)):
+                    node = jG + np.minimum(iD + dD, nD - 1)
+                    result += self._rows[node] * (fTG * fD)[..., None]
+        return result[..., 0], result[..., 1], result[..., 2], result[..., 3]
+
+    def save(self, path):
+        np.savez_compressed(path, T=self.T_axis.values, Vgs=self.Vgs_axis.values, Vds=self.Vds_axis.values,
+                            tables=self.tables, Vsb=self.Vsb, source=self.source, key=self.key)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["T"], data["Vgs"], data["Vds"], data["tables"], Vsb=float(data["Vsb"]), source=str(data["source"]),
+                       key=str(data["key"]) if "key" in data.files else "")
+
+#? -------------------------------------------------------------------------------
@@ -18,22 +18,25 @@
 #? Licence:     Refer to the LICENSE file
 #? -------------------------------------------------------------------------------
 
-import Log 
-from Equations  import Equations
+import Params
+from Equations  import Equations, at
+from Registry   import DeviceModel
 import numpy as np
 #? -------------------------------------------------------------------------------
 
-class BSIM3v3Model:
-    def __init__(self, param_path=None):
-        logger          = Log.Logger()
-        self.params     = logger.load_parameters()
-        self.eq         = Equations()
-        self.mu_0       = self.params["mu0"]["VALUE"]
-        self.C_ox       = self.params["C_ox"]["VALUE"]
-        self.alpha      = self.params["alpha"]["VALUE"]
-        self.theta      = self.params["theta"]["VALUE"]
-        self.lambda_    = self.params["lambda_"]["VALUE"]
-        self.tox        = self.params["TOX"]["VALUE"]
+class BSIM3v3Model(DeviceModel):
+    PARAMETERS = ("mu0", "C_ox", "alpha", "theta", "lambda_") + Equations.PARAMETERS
+    CHARGES    = False     #! closed-form capacitances in compute_batch(), see Equations.compute_capacitances_batch()
+
+    def __init__(self, param_path=None, params=None, eq=None):
+        self.params     = params if params is not None else Params.load(param_path)
+        self.eq         = eq if eq is not None else Equations(self.params)
+        self.mu_0       = self.params.mu0
+        self.C_ox       = self.params.C_ox
+        self.alpha      = self.params.alpha
+        self.theta      = self.params.theta
+        self.lambda_    = self.params.lambda_
+        self.tox        = self.params.TOX
         self.T          = 300
         
         self.C_g_total  = self.C_ox 
@@ -50,22 +53,92 @@ class BSIM3v3Model:
         match region:
             case "cutoff"       :   
                     Id  = 0.0
-                    Cgs = 0.0
-                    Cgd = 0.0
-                    Cds = 0.0
             case "linear"       :   
-                    Id  = mu_eff * self.C_ox * (1 /1) * ((Vsat * Vds) - 0.5 * Vds ** 2)
-                    Cgs = 0.0
-                    Cgd = 0.0
-                    Cds = 0.0
+                    Id  = mu_eff * self.C_ox * (1 /1) * ((Vsat * Vds) - 0.5 * np.square(Vds))
             case "saturation"   :   
-                    Id  = (0.5 * mu_eff * self.C_ox * (1 / 1) * Vsat ** 2 *(1 + self.lambda_ * Vds))
-                    Cgs = 0.0
-                    Cgd = 0.0
-                    Cds = 0.0
+                    Id  = (0.5 * mu_eff * self.C_ox * (1 / 1) * np.square(Vsat) *(1 + self.lambda_ * Vds))
 
+        Cgs, Cgd, Cds   = (float(C) for C in self.compute_capacitances(Vgs, Vds, Vsb, T))
         return Id ,Cgs, Cgd, Cds
 
+    def compute_charges(self, Vgs, Vds,Vsb=0.0,T=300):
+        return self.eq.compute_charges_batch(Vgs, Vds, Vsb, T, self.C_ox)
+
+    def compute_capacitances(self, Vgs, Vds,Vsb=0.0,T=300):
+        return self.eq.compute_capacitances_batch(Vgs, Vds, Vsb, T, self.C_ox)
+
+    def _array_params(self):
+        return [np.asarray(p) for p in (self.mu_0, self.theta, self.tox, self.C_ox, self.lambda_)]
+
+    def compute_batch(self, Vgs, Vds,Vsb=0.0,T=300):
+        Id              = self.compute_current(Vgs, Vds, Vsb, T)
+        Cgs, Cgd, Cds   = np.broadcast_arrays(*self.compute_capacitances(Vgs, Vds, Vsb, T), Id)[:3]
+        return Id ,Cgs, Cgd, Cds
+
+    def compute_current(self, Vgs, Vds,Vsb=0.0,T=300):
+        Vth             = self.eq.compute_Vth_batch(Vsb,T)
+        Vgs , Vds , Vth , *_ = np.broadcast_arrays(np.asarray(Vgs, dtype=float), np.asarray(Vds, dtype=float), Vth, *self._array_params())
+        Vsat            = Vgs - Vth
+
+        linear          = (Vsat > 0) & (Vsat >= Vds)    #! vds <= vgs-Vth
+        saturation      = (Vsat > 0) & (Vsat <  Vds)    #! Vds >= Vgs - Vth
+
+        Id              = np.zeros(Vsat.shape)          #! cutoff points keep Id = 0
+
+        vds , vsat      = Vds[linear] , Vsat[linear]
+        mu_0 , theta    = at(self.mu_0, Vsat.shape, linear) , at(self.theta, Vsat.shape, linear)
+        tox , C_ox , lam = at(self.tox, Vsat.shape, linear) , at(self.C_ox, Vsat.shape, linear) , at(self.lambda_, Vsat.shape, linear)
+        mu_eff          = mu_0 / (1 + theta * ( vsat / tox))
+        Id[linear]      = mu_eff * C_ox * (1 /1) * ((vsat * vds) - 0.5 * np.square(vds))
+        vds , vsat      = Vds[saturation] , Vsat[saturation]
+        mu_0 , theta    = at(self.mu_0, Vsat.shape, saturation) , at(self.theta, Vsat.shape, saturation)
+        tox , C_ox , lam = at(self.tox, Vsat.shape, saturation) , at(self.C_ox, Vsat.shape, saturation) , at(self.lambda_, Vsat.shape, saturation)
+        mu_eff          = mu_0 / (1 + theta * ( vsat / tox))
+        Id[saturation]  = (0.5 * mu_eff * C_ox * (1 / 1) * np.square(vsat) *(1 + lam * vds))
+
+        return Id
+
+    def compute_derivatives(self, Vgs, Vds,Vsb=0.0,T=300):
+        """
+        Id and its small-signal derivatives in one pass: gm = dId/dVgs,
+        gds = dId/dVds and gmb = dId/dVsb (= -gm * dVth/dVsb), including the
+        Vsat dependence of mu_eff. Id matches compute_batch(). The linear
+        expression has no (1 + lambda*Vds) factor, so Id itself steps at the
+        linear/saturation boundary; points on the boundary (Vsat == Vds) use
+        the linear branch, the same side compute() picks.
+        """
+        Vth             = self.eq.compute_Vth_batch(Vsb,T)
+        dVth            = self.eq.compute_dVth_dVsb_batch(Vsb,T)
+        Vgs , Vds , Vth , dVth , *_ = np.broadcast_arrays(np.asarray(Vgs, dtype=float), np.asarray(Vds, dtype=float), Vth, dVth, *self._array_params())
+        Vsat            = Vgs - Vth
+
+        linear          = (Vsat > 0) & (Vsat >= Vds)    #! vds <= vgs-Vth
+        saturation      = (Vsat > 0) & (Vsat <  Vds)    #! Vds >= Vgs - Vth
+
+        Id              = np.zeros(Vsat.shape)
+        gm              = np.zeros(Vsat.shape)
+        gds             = np.zeros(Vsat.shape)
+
+        vds , vsat      = Vds[linear] , Vsat[linear]
+        mu_0 , theta    = at(self.mu_0, Vsat.shape, linear) , at(self.theta, Vsat.shape, linear)
+        tox , C_ox , lam = at(self.tox, Vsat.shape, linear) , at(self.C_ox, Vsat.shape, linear) , at(self.lambda_, Vsat.shape, linear)
+        mu_eff          = mu_0 / (1 + theta * ( vsat / tox))
+        dmu_eff         = -mu_eff * (theta / tox) / (1 + theta * ( vsat / tox))
+        Id[linear]      = mu_eff * C_ox * (1 /1) * ((vsat * vds) - 0.5 * np.square(vds))
+        gm[linear]      = C_ox * (dmu_eff * ((vsat * vds) - 0.5 * np.square(vds)) + mu_eff * vds)
+        gds[linear]     = mu_eff * C_ox * (vsat - vds)
+        vds , vsat      = Vds[saturation] , Vsat[saturation]
+        mu_0 , theta    = at(self.mu_0, Vsat.shape, saturation) , at(self.theta, Vsat.shape, saturation)
+        tox , C_ox , lam = at(self.tox, Vsat.shape, saturation) , at(self.C_ox, Vsat.shape, saturation) , at(self.lambda_, Vsat.shape, saturation)
+        mu_eff          = mu_0 / (1 + theta * ( vsat / tox))
+        dmu_eff         = -mu_eff * (theta / tox) / (1 + theta * ( vsat / tox))
+        Id[saturation]  = (0.5 * mu_eff * C_ox * (1 / 1) * np.square(vsat) *(1 + lam * vds))
+        gm[saturation]  = 0.5 * C_ox * (1 + lam * vds) * (dmu_eff * np.square(vsat) + 2 * mu_eff * vsat)
+        gds[saturation] = 0.5 * mu_eff * C_ox * np.square(vsat) * lam
+
+        gmb             = -gm * dVth
+        return Id, gm, gds, gmb
+
 #? -------------------------------------------------------------------------------
 if __name__ == "__main__":
     model               = BSIM3v3Model()
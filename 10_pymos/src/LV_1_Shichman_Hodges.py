@@ -18,19 +18,22 @@
 #? Licence:     Refer to the LICENSE file
 #? -------------------------------------------------------------------------------
 
-import Log
-from Equations import Equations
+import Params
+from Equations import Equations, at
+from Registry import DeviceModel
 import numpy as np
 
 #? -------------------------------------------------------------------------------
-class ShichmanHodgesModel:
-    def __init__(self):
-        logger          = Log.Logger()
-        self.eq         = Equations()
-        self.params     = logger.load_parameters()
-        self.mu         = self.params["mu"]["VALUE"]               
-        self.C_ox       = self.params["C_ox"]["VALUE"]              
-        self.lambda_    = self.params["lambda_"]["VALUE"]           
+class ShichmanHodgesModel(DeviceModel):
+    PARAMETERS = ("C_ox", "lambda_") + Equations.PARAMETERS
+    CHARGES    = False     #! closed-form capacitances in compute_batch(), see Equations.compute_capacitances_batch()
+
+    def __init__(self, params=None, eq=None):
+        self.params     = params if params is not None else Params.load()
+        self.eq         = eq if eq is not None else Equations(self.params)
+        self.mu         = self.params.mu               
+        self.C_ox       = self.params.C_ox              
+        self.lambda_    = self.params.lambda_           
         self.KP         = 2.0718e-5 #self.mu * self.C_ox
         self.L_eff      = 1 # L_scaled * LMLT + XL_scaled - 2*(LD_scaled + DEL_scaled) 
         self.W_eff      = 1 # 1 * ( W_scaled * WMLT + XW_scaled - 2 * WD_scaled) 
@@ -48,20 +51,78 @@ class ShichmanHodgesModel:
         match region:
             case "cutoff"       :   
                         Id  = 0.0
-                        Cgs = 0.0
-                        Cgd = 0.0
-                        Cds = 0.0
             case "linear"       :   
                         Id  = self.KP * W_over_L * (1 + self.lambda_ * Vds) * (Vsat - (Vds/2)) * Vds
-                        Cgs = 0.0
-                        Cgd = 0.0
-                        Cds = 0.0
             case "saturation"   :   
                         Id  = 1/2 * self.KP * W_over_L * (1 + self.lambda_ * Vds) * np.square(Vsat)
-                        Cgs = 0.0
-                        Cgd = 0.0
-                        Cds = 0.0
+        Cgs, Cgd, Cds   = (float(C) for C in self.compute_capacitances(Vgs, Vds, Vsb, T))
+        return Id,Cgs, Cgd, Cds
+
+    def compute_charges(self, Vgs, Vds, Vsb=0.0, T=350):
+        return self.eq.compute_charges_batch(Vgs, Vds, Vsb, T, self.C_ox * self.W_eff * self.L_eff)
+
+    def compute_capacitances(self, Vgs, Vds, Vsb=0.0, T=350):
+        return self.eq.compute_capacitances_batch(Vgs, Vds, Vsb, T, self.C_ox * self.W_eff * self.L_eff)
+
+    def compute_batch(self, Vgs, Vds, Vsb=0.0, T=350):
+        Id              = self.compute_current(Vgs, Vds, Vsb, T)
+        Cgs, Cgd, Cds   = np.broadcast_arrays(*self.compute_capacitances(Vgs, Vds, Vsb, T), Id)[:3]
         return Id,Cgs, Cgd, Cds
+
+    def compute_current(self, Vgs, Vds, Vsb=0.0, T=350):
+        Vth             = self.eq.compute_Vth_batch(Vsb,T)
+        Vgs , Vds , Vth , _ = np.broadcast_arrays(np.asarray(Vgs, dtype=float), np.asarray(Vds, dtype=float), Vth, np.asarray(self.lambda_))
+        Vsat            = Vgs - Vth
+        W_over_L        = self.W_eff / self.L_eff
+
+        linear          = (Vsat > 0) & (Vsat >= Vds)    #! vds <= vgs-Vth
+        saturation      = (Vsat > 0) & (Vsat <  Vds)    #! Vds >= Vgs - Vth
+
+        Id              = np.zeros(Vsat.shape)          #! cutoff points keep Id = 0
+
+        vds , vsat      = Vds[linear] , Vsat[linear]
+        lam             = at(self.lambda_, Vsat.shape, linear)
+        Id[linear]      = self.KP * W_over_L * (1 + lam * vds) * (vsat - (vds/2)) * vds
+        vds , vsat      = Vds[saturation] , Vsat[saturation]
+        lam             = at(self.lambda_, Vsat.shape, saturation)
+        Id[saturation]  = 1/2 * self.KP * W_over_L * (1 + lam * vds) * np.square(vsat)
+        return Id
+
+    def compute_derivatives(self, Vgs, Vds, Vsb=0.0, T=350):
+        """
+        Id and its small-signal derivatives in one pass: gm = dId/dVgs,
+        gds = dId/dVds and gmb = dId/dVsb (= -gm * dVth/dVsb). Id matches
+        compute_batch(); the derivatives are continuous across the
+        linear/saturation boundary and zero in cutoff.
+        """
+        Vth             = self.eq.compute_Vth_batch(Vsb,T)
+        dVth            = self.eq.compute_dVth_dVsb_batch(Vsb,T)
+        Vgs , Vds , Vth , dVth , _ = np.broadcast_arrays(np.asarray(Vgs, dtype=float), np.asarray(Vds, dtype=float), Vth, dVth, np.asarray(self.lambda_))
+        Vsat            = Vgs - Vth
+        W_over_L        = self.W_eff / self.L_eff
+
+        linear          = (Vsat > 0) & (Vsat >= Vds)    #! vds <= vgs-Vth
+        saturation      = (Vsat > 0) & (Vsat <  Vds)    #! Vds >= Vgs - Vth
+
+        Id              = np.zeros(Vsat.shape)
+        gm              = np.zeros(Vsat.shape)
+        gds             = np.zeros(Vsat.shape)
+
+        vds , vsat      = Vds[linear] , Vsat[linear]
+        lam             = at(self.lambda_, Vsat.shape, linear)
+        clm             = 1 + lam * vds
+        Id[linear]      = self.KP * W_over_L * (1 + lam * vds) * (vsat - (vds/2)) * vds
+        gm[linear]      = self.KP * W_over_L * clm * vds
+        gds[linear]     = self.KP * W_over_L * (lam * (vsat - (vds/2)) * vds + clm * (vsat - vds))
+        vds , vsat      = Vds[saturation] , Vsat[saturation]
+        lam             = at(self.lambda_, Vsat.shape, saturation)
+        clm             = 1 + lam * vds
+        Id[saturation]  = 1/2 * self.KP * W_over_L * (1 + lam * vds) * np.square(vsat)
+        gm[saturation]  = self.KP * W_over_L * clm * vsat
+        gds[saturation] = 1/2 * self.KP * W_over_L * lam * np.square(vsat)
+
+        gmb             = -gm * dVth
+        return Id, gm, gds, gmb
 #? -------------------------------------------------------------------------------
 if __name__ == "__main__":
     model               = ShichmanHodgesModel()
@@ -24,45 +24,88 @@ import textwrap
 from rich.console import Console
 from rich.table import Table
 import textwrap
+import Profile
 #? -------------------------------------------------------------------------------
 
 class Logger:
     def __init__(self, log_dir=r"D:\WORKSPACE\PyModules\10_pymos\data"):
         self.log_dir        = log_dir
         self.log_path_txt   = os.path.join(log_dir, "vars.log")
+        self.log_path_profile = os.path.join(log_dir, "profile.log")
         self.log_path_json  = r'D:\WORKSPACE\PyModules\10_pymos\src\vars.json'
         os.makedirs(self.log_dir, exist_ok=True)
 
     def log(self, quantities):
         self._write_txt_log(quantities)
 
-    def load_parameters(self):
-        with open(self.log_path_json, "r") as f:
+    def load_parameters(self, path=None):
+        with open(path or self.log_path_json, "r") as f:
             data = json.load(f)
         return data
 
-    def _write_txt_log(self, quantities):
-        i                   = 0
+    def log_profile(self, stats, echo=True):
+        """Write Profile.summary() to profile.log and, with echo, to the terminal."""
+        tables              = []
+        table               = Table(title="PROFILE - STAGES", show_lines=False, expand=True)
+        table.add_column("Stage", style="cyan", no_wrap=True)
+        table.add_column("Calls", style="green", justify="right")
+        table.add_column("Total (s)", style="green", justify="right")
+        table.add_column("Mean (ms)", style="green", justify="right")
+        table.add_column("% of longest", style="magenta", justify="right")
+        for row in stats["timers"]:
+            table.add_row(row["name"], str(row["calls"]), f"{row['total']:.4f}", f"{1e3 * row['mean']:.4f}", f"{row['share']:.1f}")
+        tables.append(table)
+        if stats["counters"]:
+            table           = Table(title="PROFILE - COUNTERS", show_lines=False, expand=True)
+            table.add_column("Counter", style="cyan", no_wrap=True)
+            table.add_column("Count", style="green", justify="right")
+            for row in stats["counters"]:
+                table.add_row(row["name"], str(row["count"]))
+            tables.append(table)
+        if stats["hits"]:
+            table           = Table(title="PROFILE - CACHES", show_lines=False, expand=True)
+            table.add_column("Cache", style="cyan", no_wrap=True)
+            table.add_column("Hits", style="green", justify="right")
+            table.add_column("Misses", style="green", justify="right")
+            table.add_column("Hit ratio", style="magenta", justify="right")
+            for row in stats["hits"]:
+                table.add_row(row["name"], str(row["hits"]), str(row["misses"]), f"{100 * row['ratio']:.1f} %")
+            tables.append(table)
+        self._write_tables(tables, self.log_path_profile)
+        if echo:
+            console         = Console(width=130)
+            for table in tables:
+                console.print(table)
+
+    def _write_tables(self, tables, path):
         fake_output         = io.StringIO()
         console             = Console(file=fake_output, width=130, record=True)
+        for table in tables:
+            console.print(table)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("=" * 130 + "\n")
+            f.write(fake_output.getvalue())
+            f.write("=" * 130 + "\n")
+
+    def _write_txt_log(self, quantities):
+        i                   = 0
         table               = Table(title="PARAMETERS LOG", show_lines=True, expand=True)
         table.add_column("Num", style="cyan", no_wrap=True)
         table.add_column("Quantity", style="cyan", no_wrap=True)
         table.add_column("VALUE", style="green", justify="right")
+        table.add_column("SIGMA", style="green", justify="right")
         table.add_column("UNIT", style="magenta")
         table.add_column("DESCRIPTION", style="white")
 
         for key, entry in quantities.items():
             value           = entry.get("VALUE", "")
+            sigma           = entry.get("SIGMA", "")
             unit            = entry.get("UNIT", "")
             description     = entry.get("DESCRIPTION", "")
             wrapped_desc    = "\n".join(textwrap.wrap(description, width=60))
-            table.add_row(str(i), str(key), str(value), str(unit), wrapped_desc)
+            table.add_row(str(i), str(key), str(value), str(sigma), str(unit), wrapped_desc)
             i += 1
-        console.print(table)
-        with open(self.log_path_txt, "w", encoding="utf-8") as f:
-            f.write("=" * 130 + "\n")
-            f.write(fake_output.getvalue())
-            f.write("=" * 130 + "\n")
+        with Profile.timer("log.parameters"):
+            self._write_tables([table], self.log_path_txt)
 
 #? -------------------------------------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        MonteCarlo.py
+#? Purpose:     Monte-Carlo and SS/TT/FF corner analysis over the SIGMA values declared in vars.json
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import numpy as np
+import Params
+#? -------------------------------------------------------------------------------
+
+PERCENTILES = (0.135, 2.275, 15.865, 50.0, 84.135, 97.725, 99.865)     #! median and +-1/2/3 sigma
+
+CORNERS     = {                                                         #! shift in sigmas, slow = low current
+    "SS"    : {"mu": -3, "mu0": -3, "C_ox": -3, "TOX": -3, "VFB": +3, "GAMMA": +3, "theta": +3},
+    "TT"    : {},
+    "FF"    : {"mu": +3, "mu0": +3, "C_ox": +3, "TOX": +3, "VFB": -3, "GAMMA": -3, "theta": -3},
+}
+
+#? -------------------------------------------------------------------------------
+
+def statistics(values, percentiles=PERCENTILES):
+    """Mean, std and percentiles over the sample axis (axis 0)."""
+    values = np.asarray(values)
+    return {"mean": values.mean(axis=0), "std": values.std(axis=0, ddof=1) if len(values) > 1 else np.zeros(values.shape[1:]),
+            "percentiles": dict(zip(percentiles, np.percentile(values, percentiles, axis=0)))}
+
+#? -------------------------------------------------------------------------------
+
+class MonteCarlo:
+    """
+    Draws N device instances from independent normal distributions (mean
+    VALUE, standard deviation SIGMA) and evaluates them as one batch: each
+    varied parameter becomes an (N, 1) array, so compute_current() returns
+    (N, M) for M operating points. Samples are evaluated chunk samples at a
+    time to bound memory. Strictly positive parameters are clipped at 1% of
+    their nominal value.
+    """
+    def __init__(self, model_cls, params=None, names=None, seed=0, chunk=1000):
+        self.model_cls  = model_cls
+        self.params     = params if params is not None else Params.load()
+        sigmas          = self.params.sigmas()
+        self.names      = list(sigmas) if names is None else list(names)
+        self.sigma      = np.array([sigmas.get(name, 0.0) for name in self.names])
+        self.nominal    = np.array([getattr(self.params, name) for name in self.names])
+        self.rng        = np.random.default_rng(seed)
+        self.chunk      = chunk
+
+    def sample(self, n):
+        values          = self.nominal + self.sigma * self.rng.standard_normal((n, len(self.names)))
+        positive        = self.nominal > 0
+        values[:, positive] = np.maximum(values[:, positive], 0.01 * self.nominal[positive])
+        return values
+
+    def instances(self, values):
+        return self.params.replace(**{name: values[:, [i]] for i, name in enumerate(self.names)})
+
+    def run(self, n, Vgs, Vds, Vsb=0.0, T=350):
+        """
+        Evaluate n sampled devices at the operating points (Vgs, Vds, Vsb, T),
+        which broadcast to M points. Returns the samples, Id (n, M), Vth
+        (n, M) and statistics() of both.
+        """
+        shape           = np.broadcast_shapes(np.shape(Vgs), np.shape(Vds), np.shape(Vsb), np.shape(T))
+        Vgs, Vds, Vsb, T = (np.broadcast_to(np.asarray(v, dtype=float), shape).ravel() for v in (Vgs, Vds, Vsb, T))
+        values          = self.sample(n)
+        Id              = np.empty((n, Vgs.size))
+        Vth             = np.empty((n, Vgs.size))
+        for start in range(0, n, self.chunk):
+            stop        = min(start + self.chunk, n)
+            model       = self.model_cls(params=self.instances(values[start:stop]))
+            Id[start:stop]  = model.compute_current(Vgs, Vds, Vsb, T)
+            Vth[start:stop] = np.broadcast_to(model.eq.compute_Vth_batch(Vsb, T), (stop - start, Vgs.size))
+        return {"samples": dict(zip(self.names, values.T)), "Id": Id, "Vth": Vth,
+                "Id_stats": statistics(Id), "Vth_stats": statistics(Vth)}
+
+    def corner(self, name, k=1.0):
+        """Parameters of a named corner; k scales the sigma shifts in CORNERS (k=1 -> 3 sigma)."""
+        sigmas          = self.params.sigmas()
+        shifts          = {param: getattr(self.params, param) + k * n_sigma * sigmas[param]
+                           for param, n_sigma in CORNERS[name].items() if param in sigmas}
+        return self.params.replace(**shifts)
+
+    def corner_models(self, k=1.0):
+        return {name: self.model_cls(params=self.corner(name, k)) for name in CORNERS}
+
+#? -------------------------------------------------------------------------------
+if __name__ == "__main__":
+    from LV_1_Shichman_Hodges import ShichmanHodgesModel
+    mc                  = MonteCarlo(ShichmanHodgesModel)
+    result              = mc.run(10000, Vgs=np.array([10.0, 15.0, 20.0]), Vds=600.0, T=350)
+    print("-------------------------------------------------------")
+    print(f"varied: {', '.join(mc.names)}")
+    for j, vgs in enumerate([10.0, 15.0, 20.0]):
+        p = result["Id_stats"]["percentiles"]
+        print(f"Vgs={vgs:4.1f} V : Id median {p[50.0][j]:.4e} A , 3-sigma span [{p[0.135][j]:.4e}, {p[99.865][j]:.4e}] A")
+    print(f"Vth : mean {result['Vth_stats']['mean'][0]:.4f} V , std {result['Vth_stats']['std'][0]:.4f} V")
+    for name, model in mc.corner_models().items():
+        print(f"{name} : Id(Vgs=15, Vds=600) = {model.compute_current(15.0, 600.0, 0.0, 350):.4e} A")
+    print("-------------------------------------------------------")
+#? -------------------------------------------------------------------------------
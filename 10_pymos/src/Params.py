@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Params.py
+#? Purpose:     Shared, read-only parameter set loaded once per process from vars.json
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+from collections.abc import Mapping
+from types import MappingProxyType
+import numbers
+import json
+import numpy as np
+import Log
+#? -------------------------------------------------------------------------------
+
+FIELDS = (  "C_ox"      , "lambda_"   , "TOX"       , "VTo"       , "GAMMA"     ,
+            "NFS"       , "NSUB"      , "PHI"       , "mu"        , "mu0"       ,
+            "mu_exp"    , "q"         , "k"         , "eps_sic"   , "eps_ox"    ,
+            "ni"        , "PPW"       , "NJFET"     , "Nsurf"     , "XJPW"      ,
+            "dpw"       , "H_by_eff"  , "VFB"       , "Vsurf"     , "mjsurf"    ,
+            "mj"        , "m"         , "C_overlap" , "theta"     , "alpha"     ,
+            "CJ0"       )
+
+_LOADED = {}    #! path -> Parameters, filled by load()
+
+#? -------------------------------------------------------------------------------
+
+class Parameters(Mapping):
+    """
+    Immutable parameter set. Every name in FIELDS is a float attribute
+    (params.mu, params.GAMMA, ...); the full vars.json entries stay
+    available through the mapping interface (params["mu"]["UNIT"]) so the
+    set can be handed to Log.Logger.log() unchanged.
+
+    A VALUE may also be a float ndarray (see replace()); the models then
+    evaluate one device instance per element, broadcasting the parameter
+    against the operating point, e.g. shape (K, 1) against (N,) -> (K, N).
+    """
+    __slots__ = FIELDS + ("_entries",)
+
+    def __init__(self, entries):
+        for name in FIELDS:
+            if name not in entries:
+                raise KeyError(f"Missing parameter in vars.json: {name}")
+            value = entries[name].get("VALUE")
+            if isinstance(value, np.ndarray) and value.dtype.kind in "iuf":
+                value = np.array(value, dtype=float)
+                value.flags.writeable = False
+            elif isinstance(value, bool) or not isinstance(value, numbers.Real):
+                raise TypeError(f"Parameter {name} must have a numeric VALUE, got {value!r}")
+            else:
+                value = float(value)
+            object.__setattr__(self, name, value)
+            sigma = entries[name].get("SIGMA", 0.0)
+            if isinstance(sigma, bool) or not isinstance(sigma, numbers.Real) or sigma < 0:
+                raise TypeError(f"Parameter {name} must have a non-negative numeric SIGMA, got {sigma!r}")
+        object.__setattr__(self, "_entries", MappingProxyType({key: MappingProxyType(dict(entry)) for key, entry in entries.items()}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Parameters are read-only, use replace() to derive a new set")
+
+    def __delattr__(self, name):
+        raise AttributeError("Parameters are read-only")
+
+    def __reduce__(self):
+        return (Parameters, (self.to_dict(),))
+
+    def __getitem__(self, name):
+        return self._entries[name]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def to_dict(self):
+        return {key: dict(entry) for key, entry in self._entries.items()}
+
+    def sigmas(self):
+        """Standard deviation of every parameter that declares a non-zero SIGMA (same unit as VALUE)."""
+        return {name: float(self._entries[name]["SIGMA"]) for name in FIELDS if self._entries[name].get("SIGMA", 0.0) > 0}
+
+    def save(self, path):
+        entries = {key: {**entry, "VALUE": np.asarray(entry["VALUE"]).tolist()} for key, entry in self.to_dict().items()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+
+    def replace(self, **values):
+        entries = self.to_dict()
+        for name, value in values.items():
+            if name not in entries:
+                raise KeyError(f"Unknown parameter: {name}")
+            entries[name]["VALUE"] = value
+        return Parameters(entries)
+
+#? -------------------------------------------------------------------------------
+
+def load(path=None):
+    if path not in _LOADED:
+        _LOADED[path] = Parameters(Log.Logger().load_parameters(path))
+    return _LOADED[path]
+
+#? -------------------------------------------------------------------------------
@@ -17,17 +17,66 @@
 #? Created:     21/05/2025
 #? Licence:     Refer to the LICENSE file
 #? -------------------------------------------------------------------------------
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
 import os
+import Writer
 #? -------------------------------------------------------------------------------
 
+REPORT_BINS     = 1000      #! x bins per trace, each keeps its min and max sample (~ one bin per pixel column)
+REPORT_TRACES   = 10        #! curves per model and figure, evenly spaced over the swept values
+
+REPORT_HTML     = """<html><head><title>MOSFET Comparison</title><meta charset="utf-8">
+<script src="https://cdn.plot.ly/plotly-{version}.min.js"></script></head><body>
+{body}
+<script>
+const observer = new IntersectionObserver((entries) => {{
+    for (const entry of entries) {{
+        if (!entry.isIntersecting) continue;
+        observer.unobserve(entry.target);
+        const figure = JSON.parse(document.getElementById(entry.target.id + "-data").textContent);
+        Plotly.newPlot(entry.target, figure.data, figure.layout, {{responsive: true}});
+    }}
+}}, {{rootMargin: "200px"}});
+document.querySelectorAll(".figure").forEach((div) => observer.observe(div));
+</script></body></html>
+"""
+
+#? -------------------------------------------------------------------------------
+
+def decimate(x, y, bins=REPORT_BINS):
+    """
+    Min/max downsampling: split the x range into bins and keep, per bin, the
+    samples with the smallest and the largest y (in x order). Peaks survive
+    while the output never exceeds 2 * bins points.
+    """
+    x , y           = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    order           = np.argsort(x, kind="stable")
+    x , y           = x[order], y[order]
+    if x.size <= 2 * bins:
+        return x, y
+    span            = x[-1] - x[0]
+    b               = np.minimum(((x - x[0]) / span * bins).astype(np.intp), bins - 1) if span > 0 else np.zeros(x.size, np.intp)
+    by_bin          = np.lexsort((y, b))                #! sorted by bin, then by y
+    first           = np.flatnonzero(np.r_[True, b[by_bin][1:] != b[by_bin][:-1]])
+    last            = np.r_[first[1:] - 1, by_bin.size - 1]
+    keep            = np.unique(np.concatenate([by_bin[first], by_bin[last]]))
+    return x[keep], y[keep]
+
+def _pick(values, count=REPORT_TRACES):
+    """At most count values, evenly spaced over the sorted unique values (ends included)."""
+    values          = np.unique(values)
+    if values.size <= count:
+        return values
+    return values[np.unique(np.linspace(0, values.size - 1, count).round().astype(int))]
+
+
 class MOSFETModelComparer:
     def __init__(self, csv1_path, csv2_path, output_html=None):
-        self.df1 = pd.read_csv(csv1_path)
-        self.df2 = pd.read_csv(csv2_path)
+        self.df1 = Writer.read_results(csv1_path)
+        self.df2 = Writer.read_results(csv2_path)
         self.output_html = output_html or r'D:\WORKSPACE\PyModules\10_pymos\data\comparison_plot.html'
         self._validate_columns()
         self._unpack_data()
@@ -107,6 +156,70 @@ class MOSFETModelComparer:
             f.write(full_html)
 
         print(f"HTML with all plots saved to: {self.output_html}")
+
+    def _family(self, fig, models, T, key, x, y, bins, traces):
+        """One decimated Scattergl trace per selected value of key at temperature T, one groupby per model."""
+        for label, df, dash in models:
+            at_T        = df[df["T"] == T]
+            selected    = set(_pick(at_T[key].to_numpy(), traces).tolist())
+            for value, group in at_T.groupby(key, sort=True):
+                if value not in selected:
+                    continue
+                xs, ys  = decimate(group[x].to_numpy(), group[y].to_numpy(), bins)
+                fig.add_trace(go.Scattergl(x=xs, y=ys, mode="lines", name=f"{label} {key.capitalize()}={value:.1f}", line=dict(dash=dash)))
+
+    def report(self, output_html=None, T=None, bins=REPORT_BINS, traces=REPORT_TRACES):
+        """
+        Lightweight version of plot() for dense sweeps: each model is grouped
+        once per figure with DataFrame.groupby, every trace is min/max
+        decimated to at most 2 * bins points, at most traces curves are drawn
+        per family and all traces are WebGL (Scattergl). The figures are
+        embedded as JSON and only rendered when scrolled into view, so the
+        page size and build time are bounded by bins * traces and not by the
+        sweep size.
+        """
+        output_html     = output_html or os.path.splitext(self.output_html)[0] + "_report.html"
+        T               = float(self.df1["T"].min()) if T is None else T
+        models          = [("BSIM", self.df1, "solid"), ("SH", self.df2, "dot")]
+        figures         = []
+
+        for x, label in (("VDS", "Vds [V]"), ("VGS", "Vgs [V]")):
+            fig         = go.Figure()
+            for name in ("CGS", "CGD", "CDS"):
+                for model, df, dash in models:
+                    xs, ys = decimate(df[x].to_numpy(), df[name].to_numpy(), bins)
+                    fig.add_trace(go.Scattergl(x=xs, y=ys, mode="lines", name=f"{model} {name.capitalize()}", line=dict(dash=dash)))
+            fig.update_layout(title=f"Capacitances vs {label.split()[0]}", xaxis_title=label, yaxis_title="Capacitance [F]", legend=dict(x=1, y=1))
+            figures.append(fig)
+
+        fig             = go.Figure()
+        for model, df, dash in models:
+            corner      = df[(df["VGS"] == df["VGS"].max()) & (df["VDS"] == df["VDS"].max())]
+            xs, ys      = decimate(corner["T"].to_numpy(), corner["ID"].to_numpy(), bins)
+            fig.add_trace(go.Scattergl(x=xs, y=ys, mode="lines+markers", name=f"{model} Id", line=dict(dash=dash)))
+        fig.update_layout(title="Id vs Temperature (max Vgs, max Vds)", xaxis_title="Temperature [K]", yaxis_title="Id [A]", legend=dict(x=1, y=1))
+        figures.append(fig)
+
+        fig             = go.Figure()
+        self._family(fig, models, T, "VDS", "VGS", "ID", bins, traces)
+        fig.update_layout(title=f"Id vs Vgs (T={T:g}K)", xaxis_title="Vgs [V]", yaxis_title="Id [A]", legend=dict(x=1, y=1))
+        figures.append(fig)
+
+        fig             = go.Figure()
+        self._family(fig, models, T, "VGS", "VDS", "ID", bins, traces)
+        fig.update_layout(title=f"Id vs Vds (T={T:g}K)", xaxis_title="Vds [V]", yaxis_title="Id [A]", legend=dict(x=1, y=1))
+        figures.append(fig)
+
+        body            = []
+        for i, fig in enumerate(figures):
+            data        = fig.to_json().replace("</", "<\\/")
+            body.append(f'<div id="fig{i}" class="figure" style="height:600px"></div>\n'
+                        f'<script type="application/json" id="fig{i}-data">{data}</script>')
+        os.makedirs(os.path.dirname(output_html) or ".", exist_ok=True)
+        with open(output_html, "w", encoding="utf-8") as f:
+            f.write(REPORT_HTML.format(version=get_plotlyjs_version(), body="\n<hr>\n".join(body)))
+        print(f"HTML report saved to: {output_html}")
+        return output_html
 #? -------------------------------------------------------------------------------
 # if __name__ == "__main__":
 #     csv1 = r'D:\WORKSPACE\PyModules\10_pymos\data\shichman_hodges.csv'
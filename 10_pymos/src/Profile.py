@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Profile.py
+#? Purpose:     Opt-in stage timers, call counters and cache hit ratios for the simulation pipeline
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import time
+#? -------------------------------------------------------------------------------
+#?
+#?  Usage:  Profile.enable()
+#?          with Profile.timer("write"):            <- stage timer
+#?              ...
+#?          Profile.count("points", n)              <- counter
+#?          Profile.hit("equations.cache", found)   <- cache hit ratio
+#?          Log.Logger().log_profile(Profile.summary())
+#?
+#?  Disabled (the default), timer() returns one shared no-op context manager
+#?  and count()/hit() return immediately. Per-point hot paths additionally
+#?  guard their calls with "if Profile.ENABLED:" so they pay one attribute
+#?  lookup only.
+#?
+#? -------------------------------------------------------------------------------
+
+ENABLED     = False
+_TIMERS     = {}    #! name -> [calls, seconds]
+_COUNTERS   = {}    #! name -> count
+_HITS       = {}    #! name -> [hits, misses]
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL = _NullTimer()
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name       = name
+
+    def __enter__(self):
+        self.start      = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed         = time.perf_counter() - self.start
+        entry           = _TIMERS.setdefault(self.name, [0, 0.0])
+        entry[0]       += 1
+        entry[1]       += elapsed
+        return False
+
+#? -------------------------------------------------------------------------------
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = bool(on)
+
+def reset():
+    _TIMERS.clear()
+    _COUNTERS.clear()
+    _HITS.clear()
+
+def timer(name):
+    return _Timer(name) if ENABLED else _NULL
+
+def count(name, n=1):
+    if ENABLED:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+
+def hit(name, found, n=1):
+    if ENABLED:
+        entry = _HITS.setdefault(name, [0, 0])
+        entry[0 if found else 1] += n
+
+def snapshot(clear=False):
+    """Plain-dict copy of all statistics (picklable, e.g. to return them from a worker process)."""
+    stats = {"timers": {k: list(v) for k, v in _TIMERS.items()}, "counters": dict(_COUNTERS),
+             "hits": {k: list(v) for k, v in _HITS.items()}}
+    if clear:
+        reset()
+    return stats
+
+def merge(stats):
+    """Add a snapshot() taken elsewhere (worker process) to the statistics of this process."""
+    for name, (calls, seconds) in stats["timers"].items():
+        entry = _TIMERS.setdefault(name, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+    for name, n in stats["counters"].items():
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+    for name, (hits, misses) in stats["hits"].items():
+        entry = _HITS.setdefault(name, [0, 0])
+        entry[0] += hits
+        entry[1] += misses
+
+def summary():
+    """
+    Rows for Log.Logger.log_profile(): timers sorted by total time (share is
+    relative to the longest one, since stages nest), counters and hit ratios.
+    """
+    total       = max((seconds for _, seconds in _TIMERS.values()), default=0.0) or 1.0
+    timers      = [{"name": name, "calls": calls, "total": seconds, "mean": seconds / calls if calls else 0.0,
+                    "share": 100.0 * seconds / total}
+                   for name, (calls, seconds) in sorted(_TIMERS.items(), key=lambda item: -item[1][1])]
+    counters    = [{"name": name, "count": n} for name, n in sorted(_COUNTERS.items())]
+    hits        = [{"name": name, "hits": h, "misses": m, "ratio": h / (h + m) if h + m else 0.0}
+                   for name, (h, m) in sorted(_HITS.items())]
+    return {"timers": timers, "counters": counters, "hits": hits}
+
+#? -------------------------------------------------------------------------------
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Registry.py
+#? Purpose:     Common device-model interface and a name -> model registry with lazy imports
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import importlib
+import numpy as np
+#? -------------------------------------------------------------------------------
+
+_MODELS = {     #! name -> "module:Class", imported on first use only
+    "shichman_hodges"   : "LV_1_Shichman_Hodges:ShichmanHodgesModel",
+    "bsim3v3"           : "LV_13_BSIM3v3:BSIM3v3Model",
+    "lut"               : "LUT:LUTModel",
+    "bsimcmg"           : "VerilogA:VerilogAModel",
+}
+
+#? -------------------------------------------------------------------------------
+
+class DeviceModel:
+    """
+    Interface shared by every pymos device model.
+
+    compute_batch(Vgs, Vds, Vsb, T) is the one required method: it
+    broadcasts its inputs and returns the (Id, Cgs, Cgd, Cds) arrays.
+    compute() and compute_derivatives() fall back to it (scalar call,
+    central differences) unless a model provides its own, analytic versions.
+    PARAMETERS lists the vars.json names the model reads; parameter_schema()
+    returns their entries (VALUE, UNIT, ...) from the model's parameter set.
+    Models evaluated at one fixed Vsb set VSB_DEPENDENT = False (gmb = 0).
+    Models that only expose terminal charges (no closed-form capacitances)
+    set CHARGES = True and implement compute_charges() -> (Qg, Qd) and
+    compute_current() -> Id; grid sweeps then derive Cgs, Cgd and Cds from
+    the charges over the grid (see Charge).
+    Registry.create() builds models through from_params(params, eq), so
+    every registered model accepts the shared parameter set and Equations.
+    """
+    PARAMETERS      = ()
+    VSB_DEPENDENT   = True
+    CHARGES         = False
+
+    @classmethod
+    def from_params(cls, params=None, eq=None, **options):
+        """Model built from the shared pymos parameter set and Equations; models that do not use them override this."""
+        return cls(params=params, eq=eq, **options)
+
+    def compute_batch(self, Vgs, Vds, Vsb=0.0, T=350):
+        raise NotImplementedError(f"{type(self).__name__} does not implement compute_batch()")
+
+    def compute_current(self, Vgs, Vds, Vsb=0.0, T=350):
+        return self.compute_batch(Vgs, Vds, Vsb, T)[0]
+
+    def compute_charges(self, Vgs, Vds, Vsb=0.0, T=350):
+        raise NotImplementedError(f"{type(self).__name__} does not implement compute_charges()")
+
+    def compute(self, Vgs, Vds, Vsb=0.0, T=350):
+        return tuple(float(x) for x in self.compute_batch(Vgs, Vds, Vsb, T))
+
+    def compute_derivatives(self, Vgs, Vds, Vsb=0.0, T=350, h=1e-6):
+        """Id, gm = dId/dVgs, gds = dId/dVds and gmb = dId/dVsb by central differences, step h * max(1, |V|)."""
+        Vgs, Vds, Vsb, T = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (Vgs, Vds, Vsb, T)))
+        Id              = self.compute_current(Vgs, Vds, Vsb, T)
+        slopes          = []
+        inputs          = (Vgs, Vds, Vsb) if self.VSB_DEPENDENT else (Vgs, Vds)
+        for i, V in enumerate(inputs):
+            step        = h * np.maximum(1.0, np.abs(V))
+            shifted     = [Vgs, Vds, Vsb]
+            shifted[i]  = V + step
+            upper       = self.compute_current(*shifted, T)
+            shifted[i]  = V - step
+            lower       = self.compute_current(*shifted, T)
+            slopes.append((upper - lower) / (2 * step))
+        if not self.VSB_DEPENDENT:
+            slopes.append(np.zeros_like(Id))
+        gm , gds , gmb  = slopes
+        return Id, gm, gds, gmb
+
+    def parameter_schema(self):
+        params          = getattr(self, "params", None)
+        if params is None:
+            return {}
+        return {name: dict(params[name]) for name in self.PARAMETERS}
+
+#? -------------------------------------------------------------------------------
+
+def register(name, target=None):
+    """
+    Register target ("module:Class" or a class) under name. Without target
+    it returns a class decorator: @Registry.register("my_model").
+    """
+    if target is None:
+        def decorator(cls):
+            _MODELS[name] = cls
+            return cls
+        return decorator
+    _MODELS[name] = target
+    return target
+
+def available():
+    return sorted(_MODELS)
+
+def get(name):
+    if name not in _MODELS:
+        raise KeyError(f"Unknown model '{name}', registered: {', '.join(available())}")
+    target = _MODELS[name]
+    if isinstance(target, str):
+        module_name, class_name = target.split(":")
+        target = getattr(importlib.import_module(module_name), class_name)
+        _MODELS[name] = target
+    return target
+
+def create(name, **kwargs):
+    """Instance of a registered model; DeviceModel classes are built with from_params(**kwargs)."""
+    target = get(name)
+    return target.from_params(**kwargs) if hasattr(target, "from_params") else target(**kwargs)
+
+def resolve(model, **kwargs):
+    """Model instances pass through unchanged; names are created from the registry."""
+    return create(model, **kwargs) if isinstance(model, str) else model
+
+#? -------------------------------------------------------------------------------
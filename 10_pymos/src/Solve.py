@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Solve.py
+#? Purpose:     Batched inverse operating-point solver: Vgs for a target Id at given Vds, Vsb and T
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import numpy as np
+import Registry
+import Profile
+#? -------------------------------------------------------------------------------
+
+class OperatingPointSolver:
+    """
+    Solves Id(Vgs, Vds, Vsb, T) = Id_target for Vgs, for all targets at once.
+
+    Id is evaluated once at both ends of vgs_range; targets outside
+    (Id(vgs_range[0]), Id(vgs_range[1])] get Vgs = nan without iterating.
+    Every other target keeps a bracket [lo, hi] (Id rises with Vgs, so the
+    sign of Id - Id_target at each iterate moves one end). Each iteration is
+    one compute_derivatives() call over the targets not converged yet: the
+    Newton step x - f / gm is taken when it stays inside the bracket,
+    bisection otherwise (cutoff, gm = 0). A target is converged when
+    |Id - Id_target| <= rtol * |Id_target| + atol or its bracket is narrower
+    than xtol; the latter is how a target inside a step of Id (e.g. at the
+    BSIM3v3 linear/saturation boundary) ends, at the Vgs of the step.
+    """
+    def __init__(self, model, vgs_range=(0.0, 20.0), rtol=1e-9, atol=1e-15, xtol=1e-12, max_iter=60):
+        self.model      = Registry.resolve(model)
+        self.vgs_range  = (float(vgs_range[0]), float(vgs_range[1]))
+        self.rtol       = rtol
+        self.atol       = atol
+        self.xtol       = xtol
+        self.max_iter   = int(max_iter)
+
+    def solve(self, Id, Vds, Vsb=0.0, T=350, Vgs0=None):
+        """
+        Vgs for the target currents Id at (Vds, Vsb, T); all four broadcast.
+        Vgs0 is an optional starting guess of the same shape (nan = none),
+        e.g. the solution at a neighbouring bias. Returns (Vgs, converged,
+        iterations) arrays of the broadcast shape.
+        """
+        shape           = np.broadcast_shapes(np.shape(Id), np.shape(Vds), np.shape(Vsb), np.shape(T))
+        target, Vds, Vsb, T = (np.broadcast_to(np.asarray(v, dtype=float), shape).ravel() for v in (Id, Vds, Vsb, T))
+        n               = target.size
+        lo              = np.full(n, self.vgs_range[0])
+        hi              = np.full(n, self.vgs_range[1])
+        with Profile.timer("solve.model"):
+            Id_lo       = self.model.compute_current(lo, Vds, Vsb, T)
+            Id_hi       = self.model.compute_current(hi, Vds, Vsb, T)
+        reachable       = (Id_lo < target) & (target <= Id_hi)
+
+        x               = 0.5 * (lo + hi)
+        if Vgs0 is not None:
+            guess       = np.broadcast_to(np.asarray(Vgs0, dtype=float), shape).ravel()
+            usable      = np.isfinite(guess)
+            x[usable]   = np.clip(guess[usable], lo[usable], hi[usable])
+
+        converged       = np.zeros(n, dtype=bool)
+        iterations      = np.zeros(n, dtype=np.int64)
+        active          = np.flatnonzero(reachable)
+        for _ in range(self.max_iter):
+            if active.size == 0:
+                break
+            x_a         = x[active]
+            with Profile.timer("solve.model"):
+                Id_x, gm, *_ = self.model.compute_derivatives(x_a, Vds[active], Vsb[active], T[active])
+            Profile.count("solve.evaluations", active.size)
+            iterations[active] += 1
+            f           = Id_x - target[active]
+            a_lo , a_hi = lo[active] , hi[active]
+            a_lo        = np.where(f < 0, x_a, a_lo)
+            a_hi        = np.where(f > 0, x_a, a_hi)
+            lo[active] , hi[active] = a_lo , a_hi
+
+            done        = (np.abs(f) <= self.rtol * np.abs(target[active]) + self.atol) | ((a_hi - a_lo) <= self.xtol)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step    = x_a - f / gm
+            inside      = np.isfinite(step) & (step > a_lo) & (step < a_hi)
+            x[active]   = np.where(done, x_a, np.where(inside, step, 0.5 * (a_lo + a_hi)))
+            converged[active[done]] = True
+            active      = active[~done]
+
+        x[~converged]   = np.nan
+        return x.reshape(shape), converged.reshape(shape), iterations.reshape(shape)
+
+    def table(self, Id_values, Vds_values, T_values, Vsb=0.0):
+        """
+        Inverse characterization over the T x Vds x Id grid (T outermost, Id
+        innermost, like SweepEngine). Vds columns are solved coarse to fine:
+        every stride-th column first (cold), then the columns halfway between
+        solved ones, warm-started by linear interpolation of their solved
+        neighbours. Each level is one solve() over all temperatures and
+        targets, so the model is called a few times per level rather than per
+        column. Returns a column dict T, VDS, ID, VGS, CONVERGED, ITER.
+        """
+        T_axis          = np.asarray(T_values, dtype=float)
+        Vds_values      = np.asarray(Vds_values, dtype=float)
+        Id_values       = np.asarray(Id_values, dtype=float)
+        shape           = (len(T_axis), len(Vds_values), len(Id_values))
+        Vgs             = np.full(shape, np.nan)
+        ok              = np.zeros(shape, dtype=bool)
+        n_iter          = np.zeros(shape, dtype=np.int64)
+        solved          = np.zeros(shape[1], dtype=bool)
+        coarse          = 1 << max(0, (shape[1] - 1).bit_length() - 3)     #! about 8 cold columns
+        stride          = coarse
+
+        while True:
+            cols        = [j for j in range(0, shape[1], stride) if not solved[j]]
+            if stride == coarse and not solved[-1]:
+                cols.append(shape[1] - 1)
+            if cols:
+                guess   = np.stack([self._interpolate(Vgs, solved, Vds_values, j) for j in cols], axis=1)
+                cols    = np.array(cols)
+                V, c, k = self.solve(Id_values[None, None, :], Vds_values[cols][None, :, None], Vsb,
+                                     T_axis[:, None, None], Vgs0=guess)
+                Vgs[:, cols], ok[:, cols], n_iter[:, cols] = V, c, k
+                solved[cols] = True
+            if stride == 1:
+                break
+            stride    >>= 1
+
+        grid            = np.meshgrid(T_axis, Vds_values, Id_values, indexing="ij")
+        return {"T": grid[0].ravel(), "VDS": grid[1].ravel(), "ID": grid[2].ravel(),
+                "VGS": Vgs.ravel(), "CONVERGED": ok.ravel(), "ITER": n_iter.ravel()}
+
+    @staticmethod
+    def _interpolate(Vgs, solved, Vds_values, j):
+        """Starting guess for column j from the nearest solved columns on each side (nan where unknown)."""
+        left            = np.flatnonzero(solved[:j])
+        right           = j + 1 + np.flatnonzero(solved[j + 1:])
+        if left.size == 0 and right.size == 0:
+            return np.full(Vgs[:, j].shape, np.nan)
+        if left.size == 0 or right.size == 0:
+            return Vgs[:, left[-1] if left.size else right[0]]
+        a , b           = left[-1] , right[0]
+        w               = (Vds_values[j] - Vds_values[a]) / (Vds_values[b] - Vds_values[a])
+        guess           = (1 - w) * Vgs[:, a] + w * Vgs[:, b]
+        return np.where(np.isfinite(guess), guess, np.where(np.isfinite(Vgs[:, a]), Vgs[:, a], Vgs[:, b]))
+
+#? -------------------------------------------------------------------------------
+if __name__ == "__main__":
+    import time
+    solver              = OperatingPointSolver("shichman_hodges")
+    Id_values           = np.logspace(-6, -3, 1000)
+    Vds_values          = np.linspace(1.0, 800.0, 50)
+    start               = time.perf_counter()
+    result              = solver.table(Id_values, Vds_values, [350, 400, 450])
+    elapsed             = time.perf_counter() - start
+    check               = solver.model.compute_current(result["VGS"], result["VDS"], 0.0, result["T"])
+    ok                  = result["CONVERGED"]
+    print("-------------------------------------------------------")
+    print(f"{ok.size} targets in {elapsed:.3f} s , converged {ok.mean():.1%} , mean iterations {result['ITER'].mean():.2f}")
+    print(f"max relative Id error {np.max(np.abs(check[ok] / result['ID'][ok] - 1)):.2e}")
+    print("-------------------------------------------------------")
+#? -------------------------------------------------------------------------------
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Sweep.py
+#? Purpose:     Shard T x Vgs x Vds sweeps across a process pool and stream the chunks back in order
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import Registry
+import Profile
+import Charge
+#? -------------------------------------------------------------------------------
+
+_STATE = {}     #! per-process model and sweep axes, set by _init_worker()
+
+def _init_worker(model, T_values, Vgs_values, Vds_values, Vsb, profile=None):
+    if profile is not None:             #! pool worker: forked workers inherit the parent's statistics
+        Profile.enable(profile)
+        Profile.reset()
+    _STATE["model"] = model
+    _STATE["axes"]  = (np.asarray(T_values), np.asarray(Vgs_values, dtype=float), np.asarray(Vds_values, dtype=float))
+    _STATE["Vsb"]   = Vsb
+
+def _run_chunk_profiled(bounds):
+    """Pool-side _run_chunk() that also returns (and clears) the worker's Profile statistics."""
+    return _run_chunk(bounds), Profile.snapshot(clear=True)
+
+def evaluate_chunk(model, axes, Vsb, start, stop):
+    """
+    (Id, Cgs, Cgd, Cds) for the flat points [start, stop) of the T x Vgs x Vds
+    grid. Charge-only models (CHARGES) get their capacitances by
+    differentiating the charges over the grid; every other model returns
+    them from compute_batch().
+    """
+    T_values, Vgs_values, Vds_values = axes
+    shape               = (len(T_values), len(Vgs_values), len(Vds_values))
+    iT, iVgs, iVds      = np.unravel_index(np.arange(start, stop), shape)
+    T, Vgs, Vds         = T_values[iT], Vgs_values[iVgs], Vds_values[iVds]
+    if not model.CHARGES:
+        return model.compute_batch(Vgs=Vgs, Vds=Vds,Vsb=Vsb,T=T)
+    Id                  = model.compute_current(Vgs=Vgs, Vds=Vds,Vsb=Vsb,T=T)
+    return (Id,) + Charge.grid_capacitances(model, T_values, Vgs_values, Vds_values, Vsb, start, stop)
+
+def _run_chunk(bounds):
+    start, stop         = bounds
+    T_values, Vgs_values, Vds_values = _STATE["axes"]
+    shape               = (len(T_values), len(Vgs_values), len(Vds_values))
+    total_points        = shape[0] * shape[1] * shape[2]
+    index               = np.arange(start, stop)
+    iT, iVgs, iVds      = np.unravel_index(index, shape)
+    T, Vgs, Vds         = T_values[iT], Vgs_values[iVgs], Vds_values[iVds]
+
+    with Profile.timer("sweep.model"):
+        Id,Cgs, Cgd, Cds = evaluate_chunk(_STATE["model"], _STATE["axes"], _STATE["Vsb"], start, stop)
+    Profile.count("sweep.points", stop - start)
+    return {
+            'time'  : index // total_points ,
+            'T'     : T                 ,
+            'VGS'   : Vgs               ,
+            'VDS'   : Vds               ,
+            'ID'    : Id                ,
+            'CGS'   : Cgs               ,
+            'CGD'   : Cgd               ,
+            'CDS'   : Cds
+        }
+
+#? -------------------------------------------------------------------------------
+
+class SweepEngine:
+    """
+    Evaluate model.compute_batch() over the T x Vgs x Vds Cartesian product
+    (T outermost, Vds innermost, the same order as the serial loop). The
+    flattened grid is cut into chunks of chunk_size points; each worker
+    process receives a pickled copy of the model once and then only chunk
+    bounds. run() yields one column dict per chunk, always in grid order.
+    Capacitances of charge models come from the charges differentiated over
+    the Vgs x Vds grid (see Charge), so the axes must be strictly increasing.
+    model may also be a registered model name (see Registry.available()).
+    """
+    def __init__(self, model, chunk_size=65536, workers=None):
+        self.model          = Registry.resolve(model)
+        self.chunk_size     = int(chunk_size)
+        self.workers        = workers or os.cpu_count() or 1
+        if self.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+    def chunks(self, total_points):
+        return [(start, min(start + self.chunk_size, total_points)) for start in range(0, total_points, self.chunk_size)]
+
+    def run(self, T_values, Vgs_values, Vds_values, Vsb=0.0):
+        total_points    = len(T_values) * len(Vgs_values) * len(Vds_values)
+        bounds          = self.chunks(total_points)
+        init_args       = (self.model, T_values, Vgs_values, Vds_values, Vsb)
+
+        if self.workers <= 1 or len(bounds) <= 1:
+            _init_worker(*init_args)
+            for chunk in bounds:
+                yield _run_chunk(chunk)
+            return
+
+        workers         = min(self.workers, len(bounds))
+        profile         = Profile.ENABLED
+        task            = _run_chunk_profiled if profile else _run_chunk
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args + (profile,)) as pool:
+            pending     = deque()
+            todo        = iter(bounds)
+            for chunk in todo:                  #! keep at most 2 chunks per worker in flight
+                pending.append(pool.submit(task, chunk))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                result  = pending.popleft().result()
+                for chunk in todo:
+                    pending.append(pool.submit(task, chunk))
+                    break
+                if profile:
+                    result, stats = result
+                    Profile.merge(stats)
+                yield result
+
+#? -------------------------------------------------------------------------------
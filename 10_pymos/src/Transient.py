@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Transient.py
+#? Purpose:     Native double-pulse transient (implicit integration + Newton) driving the batched pymos models
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import numpy as np
+#? -------------------------------------------------------------------------------
+#?
+#?      Vdc ──┬──────────┐          Unknowns per circuit: x = [vg, vd, iL]
+#?            │          │
+#?            L  iL↓    ─┴─ D       gate  : (Cgs+Cgd) vg' - Cgd vd'  = -(vg - vp(t)) / Rg
+#?            │         ─┬─         drain : (Cds+Cgd) vd' - Cgd vg'  = -(Id + iD - iL)
+#?            ├──────────┘          load  :  L iL'                   =  Vdc - vd
+#?            │ d
+#?   vp ─Rg─ g┤ DUT                 D     :  piecewise-linear diode d -> Vdc (Vf, Ron, Roff)
+#?            │
+#?           GND
+#?
+#? -------------------------------------------------------------------------------
+
+METHODS = {"be": 1.0, "trap": 0.5}     #! theta of the theta-method
+
+class DoublePulse:
+    """
+    Double-pulse test of a low-side DUT with a clamped inductive load.
+
+    Every circuit parameter (Vdc, L, Rg, capacitances, T, ...) may be a scalar
+    or an array of length B; the B circuits are integrated together on a
+    common time axis so thousands of switching events cost one batched model
+    call per Newton iteration. Only the external capacitances enter the mass
+    matrix: the model charges are per unit gate area (W_eff = L_eff = 1 m),
+    so their capacitances would swamp the circuit until the models carry a
+    real device area. The Jacobian of each circuit is a 3x3 block, so the
+    system is block diagonal and is solved with one batched np.linalg.solve
+    per iteration.
+
+    pulses is a sequence of (t_on, t_off) gate commands; each edge ramps
+    linearly over t_rise and is used as a time-step breakpoint.
+    """
+    def __init__(self, model, Vdc=400.0, L=0.1, Rg=10.0, Vg_on=20.0, Vg_off=0.0,
+                 Cgs=1e-9, Cgd=1e-12, Cds=1e-11, Vf=1.0, Ron=0.01, Roff=1e7, T=350,
+                 pulses=((0.0, 2e-6), (3e-6, 4e-6)), t_rise=20e-9):
+        self.model      = model
+        values          = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in
+                                                (Vdc, L, Rg, Vg_on, Vg_off, Cgs, Cgd, Cds, Vf, Ron, Roff, T)))
+        (self.Vdc, self.L, self.Rg, self.Vg_on, self.Vg_off, self.Cgs, self.Cgd,
+         self.Cds, self.Vf, self.Ron, self.Roff, self.T) = values
+        self.batch      = self.Vdc.size
+        self.pulses     = [(float(a), float(b)) for a, b in pulses]
+        self.t_rise     = float(t_rise)
+
+    def gate(self, t):
+        level           = 0.0
+        for t_on, t_off in self.pulses:
+            level      += np.clip((t - t_on) / self.t_rise, 0.0, 1.0) - np.clip((t - t_off) / self.t_rise, 0.0, 1.0)
+        return self.Vg_off + (self.Vg_on - self.Vg_off) * level
+
+    def breakpoints(self, t_end):
+        edges           = [t + d for pulse in self.pulses for t in pulse for d in (0.0, self.t_rise)]
+        return sorted(t for t in set(edges) if 0.0 < t < t_end) + [t_end]
+
+    def diode(self, vd):
+        v               = vd - self.Vdc - self.Vf
+        g               = np.where(v > 0, 1 / self.Ron, 1 / self.Roff)
+        return g * v, g
+
+    def _static(self, x, t):
+        """Right-hand side g(x, t) and the device terms needed for its Jacobian."""
+        vg , vd , iL    = x[:, 0], x[:, 1], x[:, 2]
+        Id, gm, gds, _  = self.model.compute_derivatives(vg, vd, 0.0, self.T)
+        iD, gD          = self.diode(vd)
+        rhs             = np.column_stack([-(vg - self.gate(t)) / self.Rg, -(Id + iD - iL), self.Vdc - vd])
+        return rhs, Id, gm, gds, gD
+
+    def _mass(self):
+        cgs , cgd , cds = self.Cgs, self.Cgd, self.Cds
+        M               = np.zeros((self.batch, 3, 3))
+        M[:, 0, 0]      = cgs + cgd
+        M[:, 0, 1]      = -cgd
+        M[:, 1, 0]      = -cgd
+        M[:, 1, 1]      = cds + cgd
+        M[:, 2, 2]      = self.L
+        return M
+
+    def initial_state(self):
+        iD, _           = self.diode(self.Vdc)
+        return np.column_stack([self.Vg_off, self.Vdc, iD])      #! DUT off, load current = diode leakage
+
+    def _newton(self, x_prev, g_prev, M, t, h, theta, x_guess, max_newton, vtol, itol, dv_max):
+        x               = x_guess.copy()
+        for _ in range(max_newton):
+            rhs, Id, gm, gds, gD = self._static(x, t)
+            R           = np.einsum("bij,bj->bi", M, x - x_prev) / h - theta * rhs - (1 - theta) * g_prev
+            J           = M / h
+            J[:, 0, 0] += theta / self.Rg
+            J[:, 1, 0] += theta * gm
+            J[:, 1, 1] += theta * (gds + gD)
+            J[:, 1, 2] -= theta
+            J[:, 2, 1] += theta
+            dx          = np.linalg.solve(J, -R[..., None])[..., 0]
+            dx[:, :2]   = np.clip(dx[:, :2], -dv_max, dv_max)          #! voltage limiting
+            x          += dx
+            if np.all(np.abs(dx[:, :2]) < vtol) and np.all(np.abs(dx[:, 2]) < itol):
+                return x, True
+        return x, False
+
+    def run(self, t_end=6e-6, h0=1e-10, h_min=1e-15, h_max=20e-9, method="be",
+            rtol=1e-3, atol=1e-2, max_newton=30, vtol=1e-6, itol=1e-9, dv_max=50.0):
+        """
+        Integrate from 0 to t_end. The step size is adapted from the
+        difference between the Newton solution and a linear predictor
+        (weighted by atol + rtol*|x| on the voltages), shrunk after Newton
+        failures and clipped at gate-edge breakpoints.
+        Returns a dict with t (n,), vg/vd/iL/Id (n, B) and step statistics.
+        """
+        theta           = METHODS[method]
+        x               = self.initial_state()
+        M               = self._mass()
+        g_prev          = self._static(x, 0.0)[0]
+        times, states   = [0.0], [x.copy()]
+        t , h           = 0.0, h0
+        x_old , h_old   = None, None
+        accepted = rejected = 0
+        for t_stop in self.breakpoints(t_end):
+            while t < t_stop * (1 - 1e-12):
+                h       = min(h, h_max, t_stop - t)
+                if x_old is None:
+                    guess = x
+                else:
+                    guess = x + (x - x_old) * (h / h_old)
+                x_new, ok = self._newton(x, g_prev, M, t + h, h, theta, guess, max_newton, vtol, itol, dv_max)
+                if ok:
+                    scale   = atol + rtol * np.abs(x_new[:, :2])
+                    err     = np.max(np.abs(x_new[:, :2] - guess[:, :2]) / scale) if x_old is not None else 0.0
+                if not ok or err > 1.0:
+                    rejected += 1
+                    h  *= 0.25 if not ok else max(0.2, 0.9 / np.sqrt(err))
+                    if h < h_min:
+                        raise RuntimeError(f"Time step fell below h_min at t={t:.3e} s")
+                    continue
+                accepted += 1
+                x_old , h_old = x, h
+                x , t   = x_new, t + h
+                g_prev  = self._static(x, t)[0]
+                times.append(t)
+                states.append(x.copy())
+                h      *= min(2.0, 0.9 / np.sqrt(err)) if err > 0 else 2.0
+        states          = np.array(states)
+        Id              = self.model.compute_current(states[..., 0], states[..., 1], 0.0, self.T)
+        return {"t": np.array(times), "vg": states[..., 0], "vd": states[..., 1], "iL": states[..., 2],
+                "Id": Id, "accepted": accepted, "rejected": rejected}
+
+#? -------------------------------------------------------------------------------
+if __name__ == "__main__":
+    from LV_1_Shichman_Hodges import ShichmanHodgesModel
+    dpt                 = DoublePulse(ShichmanHodgesModel(), Vdc=[200.0, 400.0, 600.0])
+    result              = dpt.run()
+    print("-------------------------------------------------------")
+    print(f"steps: {result['accepted']} accepted, {result['rejected']} rejected")
+    for b, vdc in enumerate(dpt.Vdc):
+        print(f"Vdc={vdc:5.0f} V : peak Vds = {result['vd'][:, b].max():7.1f} V , peak iL = {result['iL'][:, b].max() * 1e3:6.2f} mA")
+    print("-------------------------------------------------------")
+#? -------------------------------------------------------------------------------
@@ -0,0 +1,1154 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        VerilogA.py
+#? Purpose:     Translate the Verilog-A subset used by the bundled BSIM-CMG sources into vectorized NumPy code
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+import re
+import keyword
+import hashlib
+import importlib.util
+from collections import Counter
+import numpy as np
+from Registry import DeviceModel
+#? -------------------------------------------------------------------------------
+#?
+#?  source.va ──preprocess()──> flat text ──tokenize()──> tokens ──Parser──> AST
+#?      ──Generator──> Python module (parameters(), evaluate()) ──compile_file()──> cached .py
+#?
+#?  Control flow is vectorized by predication: every if/case branch runs under
+#?  a mask (a bool scalar for parameter switches, a bool array for bias
+#?  dependent conditions) and assignments inside it become np.where(mask, new,
+#?  old). Branches whose mask is all False are skipped, so model switches
+#?  cost nothing.
+#?
+#? -------------------------------------------------------------------------------
+
+SOURCE_DIR  = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source", "bsim code")
+BSIMCMG_PATH = os.path.join(SOURCE_DIR, "bsimcmg.va")
+CACHE_DIR   = r"D:\WORKSPACE\PyModules\10_pymos\data\va_cache"
+
+BUILTIN_DEFINES = {         #! the part of constants.vams / disciplines.vams the sources rely on
+    "M_PI"          : "3.14159265358979323846",
+    "M_TWO_PI"      : "6.28318530717958647652",
+    "M_PI_2"        : "1.57079632679489661923",
+    "M_E"           : "2.7182818284590452354",
+    "P_Q"           : "1.602176462e-19",
+    "P_K"           : "1.3806503e-23",
+    "P_H"           : "6.62606876e-34",
+    "P_C"           : "2.99792458e8",
+    "P_EPS0"        : "8.854187817e-12",
+    "P_CELSIUS0"    : "273.15",
+}
+SKIPPED_INCLUDES = ("constants.vams", "disciplines.vams")
+
+SIMPARAMS   = {"gmin": 0.0}   #! $simparam() values, no gmin since no network is solved
+
+NODE_ALIASES = {"di": "d", "di1": "d", "si": "s", "si1": "s", "gi": "g", "ge": "g"}     #! internal -> terminal
+
+FUNCTIONS = {
+    "exp": "np.exp", "ln": "np.log", "log": "np.log10", "sqrt": "np.sqrt", "abs": "np.abs",
+    "min": "np.minimum", "max": "np.maximum", "pow": "_pow", "tanh": "np.tanh", "sinh": "np.sinh",
+    "cosh": "np.cosh", "atan": "np.arctan", "atan2": "np.arctan2", "sin": "np.sin", "cos": "np.cos",
+    "tan": "np.tan", "asin": "np.arcsin", "acos": "np.arccos", "floor": "np.floor", "ceil": "np.ceil",
+    "hypot": "np.hypot", "limexp": "np.exp",
+}
+NOISE       = ("white_noise", "flicker_noise", "noise_table")
+MESSAGES    = ("$strobe", "$display", "$write", "$warning", "$debug", "$monitor")
+FATAL       = ("$error", "$fatal", "$finish", "$stop")
+SI_SUFFIX   = {"T": 1e12, "G": 1e9, "M": 1e6, "K": 1e3, "k": 1e3, "m": 1e-3, "u": 1e-6, "n": 1e-9, "p": 1e-12, "f": 1e-15, "a": 1e-18}
+
+class VerilogAError(Exception):
+    pass
+
+#? -------------------------------------------------------------------------------
+#?  Runtime helpers used by the generated code
+#? -------------------------------------------------------------------------------
+
+def _any(mask):
+    return bool(np.any(mask))
+
+def _and(mask, cond):
+    if mask is True:
+        return cond
+    return np.logical_and(mask, cond)
+
+def _andnot(mask, cond):
+    if mask is True:
+        return np.logical_not(cond)
+    return np.logical_and(mask, np.logical_not(cond))
+
+def _sel(mask, new, old):
+    if np.ndim(mask) == 0:
+        return new if mask else old
+    return np.where(mask, new, old)
+
+def _ite(cond, a, b):
+    if np.ndim(cond) == 0:
+        return a if cond else b
+    return np.where(cond, a, b)
+
+def _land(a, b):
+    return np.logical_and(a, b)
+
+def _lor(a, b):
+    return np.logical_or(a, b)
+
+def _not(a):
+    return np.logical_not(a)
+
+def _pow(a, b):
+    return np.power(np.asarray(a, dtype=float), b)
+
+def _idiv(a, b):
+    return np.trunc(np.divide(a, b)).astype(np.int64)
+
+def _mod(a, b):
+    return np.fmod(a, b)
+
+def _int(x):
+    return np.round(x).astype(np.int64)
+
+def _real(x):
+    return np.asarray(x, dtype=float)[()]
+
+def _integer(x):
+    return np.round(np.asarray(x)).astype(np.int64)[()]
+
+def _ddx(x):
+    return np.zeros_like(np.asarray(x, dtype=float))
+
+def _contribute(branches, key, mask, value):
+    value = _sel(mask, value, 0.0)
+    branches[key] = branches.get(key, 0.0) + value
+
+def _error(mask, message, *args):
+    if not _any(mask):
+        return
+    first = np.argmax(np.broadcast_to(mask, np.broadcast(mask, *args).shape)) if np.ndim(mask) else 0
+    values = tuple(np.ravel(np.broadcast_to(a, np.broadcast(mask, *args).shape))[first] if np.ndim(a) else a for a in args)
+    try:
+        message = message % values
+    except (TypeError, ValueError):
+        pass
+    raise VerilogAError(message)
+
+def _check(name, value, lower, upper, lower_closed, upper_closed):
+    low_ok  = np.all(value >= lower) if lower_closed else np.all(value > lower)
+    high_ok = np.all(value <= upper) if upper_closed else np.all(value < upper)
+    if not (low_ok and high_ok):
+        raise VerilogAError(f"Parameter {name} = {value} outside {'[' if lower_closed else '('}{lower}, {upper}{']' if upper_closed else ')'}")
+
+def _exclude(name, value, excluded):
+    if np.any(value == excluded):
+        raise VerilogAError(f"Parameter {name} = {value} is excluded")
+
+#? -------------------------------------------------------------------------------
+#?  Preprocessor
+#? -------------------------------------------------------------------------------
+
+_MACRO      = re.compile(r"`(\w+)")
+_STRING     = re.compile(r'"(?:\\.|[^"\\])*"')
+
+def _strip_comments(text):
+    out, i, n = [], 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '"':
+            m = _STRING.match(text, i)
+            j = m.end() if m else n
+            out.append(text[i:j])
+            i = j
+        elif text.startswith("//", i):
+            j = text.find("\n", i)
+            i = n if j < 0 else j
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            out.append("\n" * text.count("\n", i, n if j < 0 else j))
+            i = n if j < 0 else j + 2
+        else:
+            j = i
+            while j < n and text[j] not in '"/':
+                j += 1
+            if j == i:
+                j += 1
+            out.append(text[i:j])
+            i = j
+    return "".join(out)
+
+def _split_args(text):
+    """Split a macro argument list at top-level commas (not inside brackets or strings)."""
+    args, depth, start, quoted = [], 0, 0, False
+    for i, c in enumerate(text):
+        if c == '"' and (i == 0 or text[i - 1] != "\\"):
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        elif c == "," and depth == 0:
+            args.append(text[start:i].strip())
+            start = i + 1
+    args.append(text[start:].strip())
+    return args
+
+def _closing(text, start):
+    """Index of the parenthesis closing the one at text[start] (strings skipped), or -1."""
+    depth, quoted = 0, False
+    for i in range(start, len(text)):
+        c = text[i]
+        if c == '"' and text[i - 1] != "\\":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+class Preprocessor:
+    """
+    `define (object-like and function-like, with backslash continuations),
+    `undef, `include, `ifdef / `ifndef / `else / `endif and macro expansion.
+    """
+    def __init__(self, defines=None):
+        self.macros     = {name: (None, body) for name, body in BUILTIN_DEFINES.items()}
+        self.macros.update({name: (None, str(body)) for name, body in (defines or {}).items()})
+        self.files      = []
+
+    def run(self, path):
+        out             = []
+        self._file(os.path.abspath(path), out, [])
+        return "\n".join(out)
+
+    def _file(self, path, out, stack):
+        if path in stack:
+            raise VerilogAError(f"Recursive `include of {path}")
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text        = _strip_comments(f.read())
+        self.files.append(path)
+        lines           = text.split("\n")
+        active          = [True]                #! `ifdef nesting, True when the current region is emitted
+        i               = 0
+        while i < len(lines):
+            line        = lines[i]
+            i          += 1
+            stripped    = line.strip()
+            directive   = re.match(r"`(define|undef|include|ifdef|ifndef|elsif|else|endif|timescale|default_nettype|resetall)\b\s*(.*)", stripped)
+            if directive:
+                name, rest = directive.groups()
+                while name == "define" and rest.endswith("\\") and i < len(lines):
+                    rest = rest[:-1] + "\n" + lines[i].strip()
+                    i += 1
+                if name in ("ifdef", "ifndef"):
+                    defined = rest.split()[0] in self.macros
+                    active.append(active[-1] and (defined if name == "ifdef" else not defined))
+                elif name == "elsif":
+                    active[-1] = active[-2] and not active[-1] and rest.split()[0] in self.macros
+                elif name == "else":
+                    active[-1] = active[-2] and not active[-1]
+                elif name == "endif":
+                    active.pop()
+                elif not active[-1]:
+                    continue
+                elif name == "define":
+                    self._define(rest)
+                elif name == "undef":
+                    self.macros.pop(rest.split()[0], None)
+                elif name == "include":
+                    target = rest.strip().strip('"')
+                    if os.path.basename(target) not in SKIPPED_INCLUDES:
+                        self._file(os.path.join(os.path.dirname(path), target), out, stack + [path])
+                continue
+            if not active[-1]:
+                continue
+            while line.count("(") > line.count(")") and i < len(lines):      #! macro calls spanning lines
+                line += " " + lines[i]
+                i += 1
+            out.append(self.expand(line))
+
+    def _define(self, rest):
+        m               = re.match(r"(\w+)(\(([^)]*)\))?\s*(.*)", rest, re.S)
+        if not m:
+            raise VerilogAError(f"Malformed `define: {rest[:60]}")
+        name, _, params, body = m.groups()
+        params          = [p.strip() for p in params.split(",")] if params is not None else None
+        self.macros[name] = (params, body.replace("\n", " ").strip())
+
+    def expand(self, text, depth=0):
+        if depth > 64:
+            raise VerilogAError("Macro expansion too deep")
+        out, pos        = [], 0
+        for m in _MACRO.finditer(text):
+            if m.start() < pos:
+                continue
+            name        = m.group(1)
+            if name not in self.macros:
+                raise VerilogAError(f"Undefined macro `{name}")
+            params, body = self.macros[name]
+            end         = m.end()
+            if params is not None:
+                j       = end
+                while j < len(text) and text[j].isspace():
+                    j  += 1
+                close   = _closing(text, j) if j < len(text) and text[j] == "(" else -1
+                if close < 0:
+                    raise VerilogAError(f"Missing arguments for macro `{name}")
+                args    = [self.expand(a, depth + 1) for a in _split_args(text[j + 1:close])]
+                if len(args) != len(params):
+                    raise VerilogAError(f"Macro `{name} expects {len(params)} arguments, got {len(args)}")
+                values  = {p: a if re.fullmatch(r"[\w.]+", a) else f"({a})" for p, a in zip(params, args)}
+                pattern = "|".join(re.escape(p) for p in sorted(params, key=len, reverse=True))
+                body    = re.sub(rf"(?<![\w`$])({pattern})(?!\w)", lambda _m: values[_m.group(1)], body)     #! one pass, no re-substitution
+                end     = close + 1
+            out.append(text[pos:m.start()])
+            out.append(" " + self.expand(body, depth + 1) + " ")
+            pos         = end
+        out.append(text[pos:])
+        return "".join(out)
+
+#? -------------------------------------------------------------------------------
+#?  Tokenizer and parser
+#? -------------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<num>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?(?:[TGMKkmunpfa](?!\w))?)
+  | (?P<str>"(?:\\.|[^"\\])*")
+  | (?P<sys>\$\w+)
+  | (?P<id>[A-Za-z_]\w*)
+  | (?P<op>\(\*|\*\)|<\+|\*\*|==|!=|<=|>=|&&|\|\||<<|>>|[-+*/%<>=!?:;,()\[\]{}&|^~@#.])
+""", re.X)
+
+def tokenize(text):
+    tokens, pos     = [], 0
+    for m in _TOKEN.finditer(text):
+        if m.start() != pos:
+            raise VerilogAError(f"Unexpected character {text[pos]!r} near: {text[pos:pos + 40]!r}")
+        pos         = m.end()
+        kind        = m.lastgroup
+        if kind != "ws":
+            tokens.append((kind, m.group()))
+    if pos != len(text):
+        raise VerilogAError(f"Unexpected character {text[pos]!r} near: {text[pos:pos + 40]!r}")
+    tokens.append(("eof", ""))
+    return tokens
+
+_BINARY = [     #! lowest to highest precedence
+    ("||",), ("&&",), ("|",), ("^",), ("&",), ("==", "!="), ("<", "<=", ">", ">="),
+    ("<<", ">>"), ("+", "-"), ("*", "/", "%"), ("**",),
+]
+_DISCIPLINE_WORDS = {"inout", "input", "output", "electrical", "thermal", "ground", "branch", "voltage",
+                     "current", "genvar", "wire", "discipline", "nature"}
+
+class Parser:
+    """
+    Recursive-descent parser for one Verilog-A module. Produces
+    self.parameters [(name, kind, default, ranges, excludes)], self.variables
+    {name: kind}, self.functions {name: (kind, inputs, locals, body)} and
+    self.analog (list of statements). Statements and expressions are tuples
+    tagged by their first element.
+    """
+    def __init__(self, tokens):
+        self.tokens     = tokens
+        self.i          = 0
+        self.parameters = []
+        self.variables  = {}
+        self.functions  = {}
+        self.analog     = []
+        self.module     = None
+
+    # -- token helpers ------------------------------------------------------
+    def peek(self, offset=0):
+        return self.tokens[min(self.i + offset, len(self.tokens) - 1)]
+
+    def next(self):
+        token       = self.tokens[self.i]
+        self.i     += 1
+        return token
+
+    def at(self, value):
+        return self.peek()[1] == value and self.peek()[0] in ("op", "id")
+
+    def accept(self, value):
+        if self.at(value):
+            self.i += 1
+            return True
+        return False
+
+    def expect(self, value):
+        if not self.accept(value):
+            kind, text = self.peek()
+            context = " ".join(t for _, t in self.tokens[max(0, self.i - 8):self.i + 4])
+            raise VerilogAError(f"Expected {value!r}, got {text!r} near: {context}")
+
+    def name(self):
+        kind, text  = self.next()
+        if kind != "id":
+            raise VerilogAError(f"Expected identifier, got {text!r}")
+        return text
+
+    def skip_to(self, value):
+        while not self.at(value):
+            if self.peek()[0] == "eof":
+                raise VerilogAError(f"Missing {value!r}")
+            self.i += 1
+        self.i += 1
+
+    def skip_attributes(self):
+        while self.accept("(*"):
+            self.skip_to("*)")
+
+    # -- module level -------------------------------------------------------
+    def parse(self):
+        while self.peek()[0] != "eof":
+            self.skip_attributes()
+            kind, text = self.peek()
+            if kind == "eof":
+                break
+            if text == "module":
+                self.i += 1
+                self.module = self.name()
+                self.skip_to(";")
+            elif text == "endmodule":
+                self.i += 1
+            elif text == "parameter":
+                self.i += 1
+                self.parameter()
+            elif text in ("real", "integer"):
+                self.i += 1
+                self.declaration(text, self.variables)
+            elif text == "analog" and self.peek(1)[1] == "function":
+                self.i += 2
+                self.function()
+            elif text == "analog":
+                self.i += 1
+                self.analog.append(self.statement())
+            elif text in _DISCIPLINE_WORDS or kind == "id":
+                self.skip_to(";")
+            else:
+                raise VerilogAError(f"Unexpected {text!r} at module level")
+        return self
+
+    def declaration(self, kind, table):
+        while True:
+            name = self.name()
+            if self.accept("["):                #! arrays are not part of the subset
+                raise VerilogAError(f"Array variable {name} is not supported")
+            if self.accept("="):
+                self.expression()
+            table[name] = kind
+            if not self.accept(","):
+                break
+        self.expect(";")
+
+    def parameter(self):
+        kind = "real"
+        if self.at("real") or self.at("integer"):
+            kind = self.next()[1]
+        while True:
+            name            = self.name()
+            self.expect("=")
+            default         = self.expression()
+            ranges, excludes = [], []
+            while self.at("from") or self.at("exclude"):
+                word        = self.next()[1]
+                if self.at("[") or self.at("("):
+                    lower_closed = self.next()[1] == "["
+                    lower   = self.expression()
+                    self.expect(":")
+                    upper   = self.expression()
+                    upper_closed = self.next()[1] == "]"
+                    item    = (lower, upper, lower_closed, upper_closed)
+                else:
+                    item    = self.expression()
+                (ranges if word == "from" else excludes).append(item)
+            self.parameters.append((name, kind, default, ranges, excludes))
+            if not self.accept(","):
+                break
+        self.expect(";")
+
+    def function(self):
+        kind = "real"
+        if self.at("real") or self.at("integer"):
+            kind = self.next()[1]
+        name            = self.name()
+        self.expect(";")
+        inputs, local   = [], {}
+        while True:
+            self.skip_attributes()
+            if self.at("input") or self.at("output") or self.at("inout"):
+                direction = self.next()[1]
+                while True:
+                    arg = self.name()
+                    if direction != "input":
+                        raise VerilogAError(f"{direction} argument {arg} of function {name} is not supported")
+                    inputs.append(arg)
+                    if not self.accept(","):
+                        break
+                self.expect(";")
+            elif self.at("real") or self.at("integer"):
+                self.declaration(self.next()[1], local)
+            else:
+                break
+        body            = self.statement()
+        self.expect("endfunction")
+        self.functions[name] = (kind, inputs, local, body)
+
+    # -- statements ---------------------------------------------------------
+    def statement(self):
+        self.skip_attributes()
+        kind, text      = self.peek()
+        if text == "begin" and kind == "id":
+            self.i += 1
+            if self.accept(":"):
+                self.name()
+            body        = []
+            while not self.at("end"):
+                if self.at("real") or self.at("integer"):
+                    self.declaration(self.next()[1], self.variables)
+                    continue
+                body.append(self.statement())
+            self.i += 1
+            return ("block", body)
+        if text == "if" and kind == "id":
+            self.i += 1
+            self.expect("(")
+            cond        = self.expression()
+            self.expect(")")
+            then        = self.statement()
+            other       = self.statement() if self.accept("else") else None
+            return ("if", cond, then, other)
+        if text == "case" and kind == "id":
+            self.i += 1
+            self.expect("(")
+            subject     = self.expression()
+            self.expect(")")
+            items       = []
+            while not self.accept("endcase"):
+                if self.accept("default"):
+                    self.accept(":")
+                    items.append((None, self.statement()))
+                    continue
+                values  = [self.expression()]
+                while self.accept(","):
+                    values.append(self.expression())
+                self.expect(":")
+                items.append((values, self.statement()))
+            return ("case", subject, items)
+        if text in ("for", "while", "repeat") and kind == "id":
+            raise VerilogAError(f"'{text}' loops are not part of the supported subset")
+        if text == ";":
+            self.i += 1
+            return ("block", [])
+        if kind == "sys":
+            self.i += 1
+            args        = self.arguments() if self.at("(") else []
+            self.expect(";")
+            return ("task", text, args)
+        if kind == "id" and self.peek(1)[1] == "(" and text in ("I", "V", "Temp", "Pwr"):
+            start       = self.i
+            self.i += 1
+            nodes       = self.nodes()
+            if self.accept("<+"):
+                value   = self.expression()
+                self.expect(";")
+                return ("contrib", text, nodes, value)
+            self.i      = start
+        if kind == "id":
+            name        = self.name()
+            if self.accept("="):
+                value   = self.expression()
+                self.expect(";")
+                return ("assign", name, value)
+            if self.at("("):                    #! function call used as a statement
+                args    = self.arguments()
+                self.expect(";")
+                return ("call", name, args)
+        raise VerilogAError(f"Unsupported statement starting with {text!r}")
+
+    def nodes(self):
+        self.expect("(")
+        nodes           = [self.name()]
+        while self.accept(","):
+            nodes.append(self.name())
+        self.expect(")")
+        return tuple(nodes)
+
+    def arguments(self):
+        self.expect("(")
+        args            = []
+        if not self.accept(")"):
+            args.append(self.expression())
+            while self.accept(","):
+                args.append(self.expression())
+            self.expect(")")
+        return args
+
+    # -- expressions --------------------------------------------------------
+    def expression(self):
+        cond            = self.binary(0)
+        if self.accept("?"):
+            a           = self.expression()
+            self.expect(":")
+            b           = self.expression()
+            return ("tern", cond, a, b)
+        return cond
+
+    def binary(self, level):
+        if level == len(_BINARY):
+            return self.unary()
+        left            = self.binary(level + 1)
+        while self.peek()[0] == "op" and self.peek()[1] in _BINARY[level]:
+            op          = self.next()[1]
+            right       = self.binary(level + 1) if op != "**" else self.binary(level)     #! ** is right associative
+            left        = ("bin", op, left, right)
+        return left
+
+    def unary(self):
+        if self.peek()[0] == "op" and self.peek()[1] in ("-", "+", "!", "~"):
+            op          = self.next()[1]
+            return ("un", op, self.unary())
+        return self.primary()
+
+    def primary(self):
+        kind, text      = self.next()
+        if kind == "num":
+            suffix      = text[-1] if text[-1] in SI_SUFFIX else ""
+            digits      = text[:-1] if suffix else text
+            is_int      = re.fullmatch(r"\d+", digits) is not None and not suffix
+            value       = int(digits) if is_int else float(digits) * SI_SUFFIX.get(suffix, 1.0)
+            return ("num", value, is_int)
+        if kind == "str":
+            return ("str", text)
+        if kind == "sys":
+            args        = self.arguments() if self.at("(") else []
+            return ("sys", text, args)
+        if kind == "op" and text == "(":
+            value       = self.expression()
+            self.expect(")")
+            return value
+        if kind == "op" and text == "{":
+            raise VerilogAError("Concatenations are not part of the supported subset")
+        if kind == "id":
+            if self.at("("):
+                if text in ("I", "V", "Temp", "Pwr"):
+                    return ("access", text, self.nodes())
+                return ("call", text, self.arguments())
+            return ("id", text)
+        raise VerilogAError(f"Unexpected {text!r} in expression")
+
+#? -------------------------------------------------------------------------------
+#?  Code generation
+#? -------------------------------------------------------------------------------
+
+def _mangle(name):
+    if keyword.iskeyword(name) or name in ("np", "True", "False", "None"):
+        return name + "_"
+    return name
+
+def _contains(expr, names):
+    """True if expr calls any of the functions in names."""
+    if isinstance(expr, list):
+        return any(_contains(e, names) for e in expr)
+    if not isinstance(expr, tuple):
+        return False
+    if expr[0] == "call" and expr[1] in names:
+        return True
+    return any(_contains(e, names) for e in expr[1:])
+
+def _contains_ddt(expr):
+    return _contains(expr, ("ddt",))
+
+_ZERO = ("num", 0.0, False)
+
+class Generator:
+    """
+    Emit a Python module for one parsed Verilog-A module. Unsupported but
+    non-essential constructs (noise sources, ddx(), probes of branch
+    currents, non-linear use of ddt()) evaluate to zero and are counted in
+    self.unsupported, which the generated module exposes as UNSUPPORTED.
+    """
+    def __init__(self, parser):
+        self.p          = parser
+        self.lines      = []
+        self.indent     = 0
+        self.temp       = 0
+        self.unsupported = Counter()
+        self.params     = {name: kind for name, kind, *_ in parser.parameters}
+        self.nodes      = set()
+        self.scope      = None                  #! local names of the function being generated
+
+    def emit(self, line):
+        self.lines.append("    " * self.indent + line)
+
+    def new(self, prefix):
+        self.temp      += 1
+        return f"_{prefix}{self.temp}"
+
+    # -- expressions --------------------------------------------------------
+    def is_int(self, e):
+        tag = e[0]
+        if tag == "num":
+            return e[2]
+        if tag == "id":
+            kinds = {**self.p.variables, **self.params, **(self.scope or {})}
+            return kinds.get(e[1]) == "integer"
+        if tag == "un":
+            return e[1] in "-+" and self.is_int(e[2])
+        if tag == "bin":
+            return e[1] in ("+", "-", "*", "/", "%") and self.is_int(e[2]) and self.is_int(e[3])
+        return False
+
+    def expr(self, e):
+        tag = e[0]
+        if tag == "num":
+            return repr(e[1])
+        if tag == "str":
+            return e[1]
+        if tag == "id":
+            if e[1] == "inf":
+                return "np.inf"
+            return _mangle(e[1])
+        if tag == "un":
+            op, value = e[1], self.expr(e[2])
+            if op == "!":
+                return f"_not({value})"
+            if op == "~":
+                return f"np.invert({value})"
+            return f"({op}{value})"
+        if tag == "bin":
+            op, a, b = e[1], self.expr(e[2]), self.expr(e[3])
+            if op == "/" and self.is_int(e[2]) and self.is_int(e[3]):
+                return f"_idiv({a}, {b})"
+            if op == "%":
+                return f"_mod({a}, {b})"
+            if op == "**":
+                return f"_pow({a}, {b})"
+            if op == "&&":
+                return f"_land({a}, {b})"
+            if op == "||":
+                return f"_lor({a}, {b})"
+            return f"({a} {op} {b})"
+        if tag == "tern":
+            return f"_ite({self.expr(e[1])}, {self.expr(e[2])}, {self.expr(e[3])})"
+        if tag == "access":
+            return self.access(e[1], e[2])
+        if tag == "sys":
+            return self.system(e[1], e[2])
+        if tag == "call":
+            return self.call(e[1], e[2])
+        raise VerilogAError(f"Cannot generate expression {tag}")
+
+    def access(self, kind, nodes):
+        if kind in ("V", "Temp"):
+            for n in nodes:
+                self.nodes.add(n)
+            if len(nodes) == 1:
+                return f"_V_{nodes[0]}"
+            return f"(_V_{nodes[0]} - _V_{nodes[1]})"
+        self.unsupported[f"{kind}() probe"] += 1
+        return "0.0"
+
+    def system(self, name, args):
+        if name == "$temperature":
+            return "_temperature"
+        if name == "$vt":
+            temperature = self.expr(args[0]) if args else "_temperature"
+            return f"(1.3806503e-23 * {temperature} / 1.602176462e-19)"
+        if name == "$simparam":
+            return f"_simparams.get({self.expr(args[0])}, {self.expr(args[1]) if len(args) > 1 else '0.0'})"
+        if name == "$param_given":
+            return f"({args[0][1]!r} in _given)"
+        if name == "$port_connected":
+            return "0"
+        if name in ("$mfactor",):
+            return "1.0"
+        if name in ("$abstime", "$realtime"):
+            return "0.0"
+        self.unsupported[f"{name}()"] += 1
+        return "0.0"
+
+    def call(self, name, args):
+        if name in FUNCTIONS:
+            return f"{FUNCTIONS[name]}({', '.join(self.expr(a) for a in args)})"
+        if name in self.p.functions:
+            return f"f_{name}({', '.join(self.expr(a) for a in args)})"
+        if name == "ddx":
+            self.unsupported["ddx() (operating-point output, use compute_derivatives())"] += 1
+            return f"_ddx({self.expr(args[0])})"
+        if name == "ddt":
+            self.unsupported["ddt() outside a contribution"] += 1
+            return "0.0"
+        if name in NOISE:
+            return "0.0"
+        if name == "analysis":
+            return "False"
+        if name in ("idt", "idtmod", "laplace_nd", "laplace_zp", "transition", "slew", "absdelay", "last_crossing"):
+            self.unsupported[f"{name}()"] += 1
+            return "0.0"
+        raise VerilogAError(f"Unknown function {name}()")
+
+    # -- ddt splitting for contributions -------------------------------------
+    def split(self, e):
+        """(static, dynamic) parts of a contribution, dynamic being the argument of ddt()."""
+        if not _contains_ddt(e) and not self._has_noise(e):
+            return e, _ZERO
+        tag = e[0]
+        if tag == "call" and e[1] == "ddt":
+            return _ZERO, e[2][0]
+        if tag == "call" and e[1] in NOISE:
+            return _ZERO, _ZERO
+        if tag == "un" and e[1] in "+-":
+            s, d = self.split(e[2])
+            return ("un", e[1], s), ("un", e[1], d)
+        if tag == "bin" and e[1] in "+-":
+            s1, d1 = self.split(e[2])
+            s2, d2 = self.split(e[3])
+            return ("bin", e[1], s1, s2), ("bin", e[1], d1, d2)
+        if tag == "bin" and e[1] == "*" and not (_contains_ddt(e[2]) and _contains_ddt(e[3])):
+            if _contains_ddt(e[2]) or self._has_noise(e[2]):
+                s, d = self.split(e[2])
+                return ("bin", "*", s, e[3]), ("bin", "*", d, e[3])
+            s, d = self.split(e[3])
+            return ("bin", "*", e[2], s), ("bin", "*", e[2], d)
+        if tag == "bin" and e[1] == "/" and not _contains_ddt(e[3]):
+            s, d = self.split(e[2])
+            return ("bin", "/", s, e[3]), ("bin", "/", d, e[3])
+        self.unsupported["non-linear use of ddt()"] += 1
+        return e, _ZERO
+
+    def _has_noise(self, e):
+        return _contains(e, NOISE)
+
+    def _zero(self, e):
+        if e == _ZERO:
+            return True
+        if e[0] == "un":
+            return self._zero(e[2])
+        if e[0] == "bin" and e[1] in "+-":
+            return self._zero(e[2]) and self._zero(e[3])
+        if e[0] == "bin" and e[1] in "*/":
+            return self._zero(e[2])
+        return False
+
+    # -- statements ---------------------------------------------------------
+    def assigned(self, statements, names):
+        for s in statements:
+            if s is None:
+                continue
+            if s[0] == "assign":
+                names.add(s[1])
+            elif s[0] == "block":
+                self.assigned(s[1], names)
+            elif s[0] == "if":
+                self.assigned([s[2], s[3]], names)
+            elif s[0] == "case":
+                self.assigned([stmt for _, stmt in s[2]], names)
+        return names
+
+    def block(self, statements, mask):
+        start = len(self.lines)
+        for s in statements:
+            self.stmt(s, mask)
+        if len(self.lines) == start:
+            self.emit("pass")
+
+    def stmt(self, s, mask):
+        tag = s[0]
+        if tag == "block":
+            for x in s[1]:
+                self.stmt(x, mask)
+        elif tag == "assign":
+            name = _mangle(s[1])
+            value = self.expr(s[2])
+            kinds = {**self.p.variables, **(self.scope or {})}
+            if kinds.get(s[1]) == "integer" and not self.is_int(s[2]):
+                value = f"_int({value})"
+            if mask == "True":
+                self.emit(f"{name} = {value}")
+            else:
+                self.emit(f"{name} = _sel({mask}, {value}, {name})")
+        elif tag == "if":
+            cond = self.new("c")
+            self.emit(f"{cond} = {self.expr(s[1])}")
+            for branch, combine in ((s[2], "_and"), (s[3], "_andnot")):
+                if branch is None:
+                    continue
+                m = self.new("m")
+                self.emit(f"{m} = {combine}({mask}, {cond})")
+                self.emit(f"if _any({m}):")
+                self.indent += 1
+                self.block([branch], m)
+                self.indent -= 1
+        elif tag == "case":
+            subject = self.new("s")
+            rest = self.new("r")
+            self.emit(f"{subject} = {self.expr(s[1])}")
+            self.emit(f"{rest} = {mask}")
+            for values, body in s[2]:
+                m = self.new("m")
+                if values is None:
+                    self.emit(f"{m} = {rest}")
+                else:
+                    cond = " | ".join(f"({subject} == {self.expr(v)})" for v in values)
+                    c = self.new("c")
+                    self.emit(f"{c} = {cond}")
+                    self.emit(f"{m} = _and({rest}, {c})")
+                    self.emit(f"{rest} = _andnot({rest}, {c})")
+                self.emit(f"if _any({m}):")
+                self.indent += 1
+                self.block([body], m)
+                self.indent -= 1
+        elif tag == "contrib":
+            kind, nodes, value = s[1], s[2], s[3]
+            for n in nodes:
+                self.nodes.add(n)
+            key = repr((nodes[0], nodes[1] if len(nodes) > 1 else "gnd"))
+            if kind == "V":
+                self.emit(f"_contribute(_VSRC, {key}, {mask}, {self.expr(value)})")
+                return
+            static, dynamic = self.split(value)
+            if not self._zero(static):
+                self.emit(f"_contribute(_I, {key}, {mask}, {self.expr(static)})")
+            if not self._zero(dynamic):
+                self.emit(f"_contribute(_Q, {key}, {mask}, {self.expr(dynamic)})")
+        elif tag == "task":
+            name, args = s[1], s[2]
+            if name in FATAL:
+                self.emit(f"_error({mask}, {', '.join(self.expr(a) for a in args) or repr(name)})")
+            elif name not in MESSAGES:
+                self.unsupported[f"{name} task"] += 1
+        elif tag == "call":
+            self.unsupported[f"{s[1]}() statement"] += 1
+        else:
+            raise VerilogAError(f"Cannot generate statement {tag}")
+
+    # -- module -------------------------------------------------------------
+    def function(self, name, kind, inputs, local, body):
+        self.scope = dict(local, **{name: kind})
+        self.emit(f"def f_{name}({', '.join(_mangle(a) for a in inputs)}):")
+        self.indent += 1
+        for var in sorted(set(local) | {name} | self.assigned([body], set()) - set(inputs)):
+            self.emit(f"{_mangle(var)} = {'_I0' if self.scope.get(var) == 'integer' else '_R0'}")
+        self.block([body], "True")
+        self.emit(f"return {_mangle(name)}")
+        self.indent -= 1
+        self.emit("")
+        self.scope = None
+
+    def generate(self, source_name, digest):
+        p = self.p
+        self.emit(f"# Generated by VerilogA.py from {source_name} (sha256 {digest}), do not edit.")
+        self.emit("import numpy as np")
+        self.emit("from VerilogA import (_any, _and, _andnot, _sel, _ite, _land, _lor, _not, _pow, _idiv, _mod,")
+        self.emit("                      _int, _real, _integer, _ddx, _contribute, _error, _check, _exclude)")
+        self.emit("")
+        self.emit("_R0 , _I0   = np.float64(0.0), np.int64(0)     # Verilog-A variables start at 0, numpy scalars divide by 0 without raising")
+        self.emit("")
+        for name, (kind, inputs, local, body) in p.functions.items():
+            self.function(name, kind, inputs, local, body)
+
+        self.emit("def parameters(_given, _simparams):")
+        self.indent += 1
+        self.emit('"""Parameter values in declaration order, _given overrides the defaults."""')
+        for name, kind, default, ranges, excludes in p.parameters:
+            var = _mangle(name)
+            cast = "_integer" if kind == "integer" else "_real"
+            self.emit(f"{var} = {cast}(_given[{name!r}] if {name!r} in _given else {self.expr(default)})")
+            for lower, upper, lower_closed, upper_closed in ranges:
+                self.emit(f"_check({name!r}, {var}, {self.expr(lower)}, {self.expr(upper)}, {lower_closed}, {upper_closed})")
+            for item in excludes:
+                if isinstance(item, tuple) and item[0] in ("num", "id", "un", "bin", "tern", "call", "sys"):
+                    self.emit(f"_exclude({name!r}, {var}, {self.expr(item)})")
+        self.emit("return {" + ", ".join(f"{n!r}: {_mangle(n)}" for n, *_ in p.parameters) + "}")
+        self.indent -= 1
+        self.emit("")
+
+        body = p.analog
+        variables = sorted((set(p.variables) | self.assigned(body, set())) - set(self.params))
+        start = len(self.lines)
+        self.emit("def evaluate(_P, _given, _V, _temperature, _simparams):")
+        self.indent += 1
+        self.emit('"""Run the analog block; returns (variables, static branch currents, branch charges, voltage sources)."""')
+        for name in self.params:
+            self.emit(f"{_mangle(name)} = _P[{name!r}]")
+        for name in variables:
+            self.emit(f"{_mangle(name)} = {'_I0' if p.variables.get(name) == 'integer' else '_R0'}")
+        node_line = len(self.lines)
+        self.emit("_I, _Q, _VSRC = {}, {}, {}")
+        self.block(body, "True")
+        self.emit("return ({" + ", ".join(f"{n!r}: {_mangle(n)}" for n in variables) + "}, _I, _Q, _VSRC)")
+        self.indent -= 1
+        self.lines[node_line:node_line] = [f"    _V_{n} = _V[{n!r}]" for n in sorted(self.nodes)]
+
+        header = [
+            "",
+            f"MODULE      = {p.module!r}",
+            f"DIGEST      = {digest!r}",
+            f"PARAMETERS  = {tuple((n, k) for n, k, *_ in p.parameters)!r}",
+            f"NODES       = {tuple(sorted(self.nodes))!r}",
+            f"UNSUPPORTED = {dict(sorted(self.unsupported.items()))!r}",
+            "",
+        ]
+        self.lines[4:4] = header
+        return "\n".join(self.lines) + "\n"
+
+#? -------------------------------------------------------------------------------
+
+def translate(path, defines=None):
+    """Translate a Verilog-A file to Python source; returns (source, sha256 of the preprocessed text)."""
+    pre             = Preprocessor(defines)
+    text            = pre.run(path)
+    digest          = hashlib.sha256((text + _translator_digest()).encode()).hexdigest()
+    parser          = Parser(tokenize(text)).parse()
+    return Generator(parser).generate(os.path.basename(path), digest), digest
+
+def _translator_digest():
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def compile_file(path=BSIMCMG_PATH, cache_dir=CACHE_DIR, defines=None):
+    """
+    Import the translation of path, generating it only if the preprocessed
+    sources (every `include) or this translator changed since the cached
+    copy in cache_dir was written.
+    """
+    text            = Preprocessor(defines).run(path)
+    digest          = hashlib.sha256((text + _translator_digest()).encode()).hexdigest()
+    stem            = re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+    target          = os.path.join(cache_dir, f"{stem}_{digest[:16]}.py")
+    if not os.path.exists(target):
+        source, _   = translate(path, defines)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path    = target + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(source)
+        os.replace(tmp_path, target)
+    spec            = importlib.util.spec_from_file_location(f"va_{stem}_{digest[:16]}", target)
+    module          = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+#? -------------------------------------------------------------------------------
+
+class VerilogAModel(DeviceModel):
+    """
+    Device model backed by a translated Verilog-A module (BSIM-CMG by
+    default). params are Verilog-A parameter overrides (name -> value,
+    scalars or arrays); unspecified ones keep their source defaults.
+
+    Terminals are mapped as d = Vds, g = Vgs, s = 0, e = -Vsb. Internal
+    nodes are tied to their terminal (NODE_ALIASES), i.e. series
+    resistances are not solved. Id is the IDS output variable; Cgs, Cgd and
+    Cds are -dQG/dVs, -dQG/dVd and -dQD/dVs with the body moving with the
+    source (Vsb fixed, the convention of Charge), by central differences of
+    the QG / QD output charges in compute_batch(); grid sweeps differentiate
+    compute_charges() over the grid instead (one evaluation per point).
+    """
+    CHARGES         = True
+
+    def __init__(self, path=BSIMCMG_PATH, params=None, cache_dir=CACHE_DIR, defines=None, simparams=None, h=1e-4):
+        self.path       = path
+        self.simparams  = dict(SIMPARAMS, **(simparams or {}))
+        self.cache_dir  = cache_dir
+        self.defines    = dict(defines or {})
+        self.given      = dict(params or {})
+        self.h          = h
+        self._load()
+
+    @classmethod
+    def from_params(cls, params=None, eq=None, **options):
+        """The pymos parameter set and Equations do not apply to a Verilog-A module; only a dict of overrides is passed on."""
+        return cls(params=params if isinstance(params, dict) else None, **options)
+
+    def _load(self):
+        self.module     = compile_file(self.path, self.cache_dir, self.defines)
+        unknown         = set(self.given) - {name for name, _ in self.module.PARAMETERS}
+        if unknown:
+            raise KeyError(f"Unknown Verilog-A parameters: {', '.join(sorted(unknown))}")
+        self.values     = self.module.parameters(self.given, self.simparams)
+        self.unsupported = self.module.UNSUPPORTED
+        self.digest     = self.module.DIGEST
+
+    def __getstate__(self):
+        state           = self.__dict__.copy()
+        state.pop("module")                     #! modules do not pickle, workers re-import from the cache
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._load()
+
+    def parameter_schema(self):
+        return {name: {"VALUE": self.values[name], "TYPE": kind} for name, kind in self.module.PARAMETERS}
+
+    def evaluate(self, voltages, T=350):
+        """Raw outputs for node voltages {node: array}; missing internal nodes follow NODE_ALIASES, others are 0."""
+        nodes           = {}
+        for node in self.module.NODES:
+            nodes[node] = voltages.get(node, voltages.get(NODE_ALIASES.get(node), 0.0))
+        with np.errstate(all="ignore"):
+            return self.module.evaluate(self.values, self.given, nodes, np.asarray(T, dtype=float), self.simparams)
+
+    def _bias(self, Vgs, Vds, Vsb, T):
+        Vgs, Vds, Vsb, T = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (Vgs, Vds, Vsb, T)))
+        return {"d": Vds, "g": Vgs, "s": np.zeros_like(Vgs), "e": -Vsb}, T
+
+    def compute_current(self, Vgs, Vds, Vsb=0.0, T=350):
+        bias, T         = self._bias(Vgs, Vds, Vsb, T)
+        return np.broadcast_to(self.evaluate(bias, T)[0]["IDS"], T.shape)
+
+    def compute_charges(self, Vgs, Vds, Vsb=0.0, T=350):
+        bias, T         = self._bias(Vgs, Vds, Vsb, T)
+        out             = self.evaluate(bias, T)[0]
+        return tuple(np.broadcast_arrays(out["QG"], out["QD"], T)[:2])
+
+    def compute_batch(self, Vgs, Vds, Vsb=0.0, T=350):
+        bias, T         = self._bias(Vgs, Vds, Vsb, T)
+        out             = self.evaluate(bias, T)[0]
+        charges         = {}
+        for node, step in (("d", self.h), ("d", -self.h), ("s", self.h), ("s", -self.h)):
+            shifted     = dict(bias)
+            for moved in (("s", "e") if node == "s" else (node,)):     #! body follows the source
+                shifted[moved] = bias[moved] + step
+            charges[node, step] = self.evaluate(shifted, T)[0]
+        h2              = 2 * self.h
+        Cgd             = -(charges["d", self.h]["QG"] - charges["d", -self.h]["QG"]) / h2
+        Cgs             = -(charges["s", self.h]["QG"] - charges["s", -self.h]["QG"]) / h2
+        Cds             = -(charges["s", self.h]["QD"] - charges["s", -self.h]["QD"]) / h2
+        return tuple(np.broadcast_arrays(out["IDS"], Cgs, Cgd, Cds))
+
+#? -------------------------------------------------------------------------------
+if __name__ == "__main__":
+    import time
+    start               = time.perf_counter()
+    model               = VerilogAModel()
+    print("-------------------------------------------------------")
+    print(f"{model.module.MODULE}: {len(model.module.PARAMETERS)} parameters, loaded in {time.perf_counter() - start:.2f} s")
+    for construct, count in model.unsupported.items():
+        print(f"  evaluated as 0: {construct} x{count}")
+    Vgs , Vds           = np.meshgrid(np.linspace(0.0, 1.0, 101), np.linspace(0.0, 1.0, 101))
+    start               = time.perf_counter()
+    Id, Cgs, Cgd, Cds   = model.compute_batch(Vgs, Vds, 0.0, 300.15)
+    print(f"{Id.size} bias points in {time.perf_counter() - start:.3f} s, Id(1 V, 1 V) = {Id[-1, -1]:.4e} A")
+    print("-------------------------------------------------------")
+#? -------------------------------------------------------------------------------
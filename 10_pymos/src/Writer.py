@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# coding=utf-8
+#? -------------------------------------------------------------------------------
+#?
+#?                 ______  ____  _______  _____
+#?                / __ \ \/ /  |/  / __ \/ ___/
+#?               / /_/ /\  / /|_/ / / / /\__ \
+#?              / ____/ / / /  / / /_/ /___/ /
+#?             /_/     /_/_/  /_/\____//____/
+#?
+#? Name:        Writer.py
+#? Purpose:     Stream sweep results to disk chunk by chunk (CSV, .npy or Parquet)
+#?
+#? Author:      Mohamed Gueni (mohamedgueni@outlook.com)
+#?
+#? Created:     21/05/2025
+#? Licence:     Refer to the LICENSE file
+#? -------------------------------------------------------------------------------
+import os
+import numpy as np
+import pandas as pd
+import Profile
+#? -------------------------------------------------------------------------------
+
+COLUMNS = ("time", "T", "VGS", "VDS", "ID", "CGS", "CGD", "CDS")
+DTYPE   = np.dtype([("time", np.int64)] + [(name, np.float64) for name in COLUMNS[1:]])
+
+#? -------------------------------------------------------------------------------
+
+class ResultWriter:
+    """
+    Base class for the sinks used by simulate_model. write() takes one
+    chunk (a dict of equal-length column arrays) and pushes it to disk
+    immediately, so an interrupted sweep leaves every finished chunk on disk.
+    """
+    def __init__(self, path):
+        self.path           = path
+        self.rows_written   = 0
+        directory           = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, chunk):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class CSVWriter(ResultWriter):
+    def __init__(self, path):
+        super().__init__(path)
+        self._file          = open(path, "w", newline="", encoding="utf-8")
+
+    def write(self, chunk):
+        with Profile.timer("write.frame"):
+            frame           = pd.DataFrame(chunk, columns=COLUMNS)
+        with Profile.timer("write.csv"):
+            frame.to_csv(self._file, header=self.rows_written == 0, index=False)
+        self._file.flush()
+        self.rows_written  += len(chunk["ID"])
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self.rows_written == 0:
+            self._file.write(",".join(COLUMNS) + "\n")
+        self._file.close()
+
+class NpyWriter(ResultWriter):
+    """
+    Preallocates a structured .npy file of total_points rows (typed columns,
+    see DTYPE) and fills it through a memory map. Rows past rows_written are
+    still zero if the sweep was interrupted.
+    """
+    def __init__(self, path, total_points):
+        super().__init__(path)
+        self._data          = np.lib.format.open_memmap(path, mode="w+", dtype=DTYPE, shape=(total_points,))
+
+    def write(self, chunk):
+        stop                = self.rows_written + len(chunk["ID"])
+        block               = self._data[self.rows_written:stop]
+        for name in COLUMNS:
+            block[name]     = chunk[name]
+        self._data.flush()
+        self.rows_written   = stop
+
+    def close(self):
+        if self._data is not None:
+            self._data.flush()
+            self._data      = None
+
+class ParquetWriter(ResultWriter):
+    def __init__(self, path):
+        super().__init__(path)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        self._pa            = pyarrow
+        self._schema        = pyarrow.schema([(name, pyarrow.from_numpy_dtype(DTYPE[name])) for name in COLUMNS])
+        self._writer        = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, chunk):
+        arrays              = [self._pa.array(np.asarray(chunk[name], dtype=DTYPE[name])) for name in COLUMNS]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self.rows_written  += len(chunk["ID"])
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer    = None
+
+#? -------------------------------------------------------------------------------
+
+def open_writer(path, total_points):
+    ext = os.path.splitext(path)[1].lower()
+    match ext:
+        case ".csv"     :   return CSVWriter(path)
+        case ".npy"     :   return NpyWriter(path, total_points)
+        case ".parquet" :   return ParquetWriter(path)
+    raise ValueError(f"Unsupported result format: {ext} (use .csv, .npy or .parquet)")
+
+def read_results(path):
+    ext = os.path.splitext(path)[1].lower()
+    match ext:
+        case ".csv"     :   return pd.read_csv(path)
+        case ".npy"     :   return pd.DataFrame(np.load(path, mmap_mode="r"))
+        case ".parquet" :   return pd.read_parquet(path)
+    raise ValueError(f"Unsupported result format: {ext} (use .csv, .npy or .parquet)")
+
+#? -------------------------------------------------------------------------------
@@ -17,52 +17,69 @@
 #? Licence:     Refer to the LICENSE file
 #? -------------------------------------------------------------------------------
 import numpy as np
-import pandas as pd
-import LV_13_BSIM3v3
-import LV_1_Shichman_Hodges
 from Plot import MOSFETModelComparer
 import Log
+import Writer
+import Params
+import Registry
+import Profile
+from Equations import Equations
+from Sweep import SweepEngine
+from Cache import CachedSweep
+from Adaptive import AdaptiveSweep
 #? -------------------------------------------------------------------------------
 Vgs_values  = np.linspace(0.0, 20.0, 19)
 Vds_values  = np.linspace(0.0, 800.0, 19)
 T_values    = [350, 375, 400, 425, 450]
 SH_PATH     = r"D:\WORKSPACE\PyModules\10_pymos\data\shichman_hodges.csv"
 BSIM3_PATH  = r"D:\WORKSPACE\PyModules\10_pymos\data\BSIM3v3.csv"
+MODELS      = {"bsim3v3": BSIM3_PATH, "shichman_hodges": SH_PATH}     #! any registered name -> output, see Registry.available() and DeviceModel.from_params()
 PLOT        = True
+REPORT      = True      #! decimated, lazily rendered WebGL report instead of the full-resolution plot()
+WORKERS     = None      #! None -> os.cpu_count()
+CHUNK_SIZE  = 65536
+ADAPTIVE    = False     #! refine around region boundaries instead of the uniform grid
+CACHE       = True      #! reuse points already computed for the same model, parameters and Vsb
+PROFILE     = False     #! per-stage timers, counters and cache hit ratios, written to profile.log
 logger      = Log.Logger()
-data_dict   = logger.load_parameters()
-sh_model    = LV_1_Shichman_Hodges.ShichmanHodgesModel()
-bsim3_model = LV_13_BSIM3v3.BSIM3v3Model()
+data_dict   = Params.load()
+equations   = Equations(data_dict)
 #? -------------------------------------------------------------------------------
 def simulate_model(model, T_values, Vgs_values, Vds_values, path):
-    records         = []
-    combinations    = [(T, Vgs, Vds) for T in T_values for Vgs in Vgs_values for Vds in Vds_values]
-    total_points    = len(combinations)
+    if CACHE:
+        engine      = CachedSweep(model, chunk_size=CHUNK_SIZE, workers=WORKERS)
+    else:
+        engine      = SweepEngine(model, chunk_size=CHUNK_SIZE, workers=WORKERS)
+    total_points    = len(T_values) * len(Vgs_values) * len(Vds_values)
+    with Writer.open_writer(path, total_points) as writer:
+        for chunk in engine.run(T_values, Vgs_values, Vds_values, Vsb=0.0):
+            writer.write(chunk)
 
-    for i, (T, Vgs, Vds) in enumerate(combinations):
-        Id,Cgs, Cgd, Cds    = model.compute(Vgs=Vgs, Vds=Vds,Vsb=0.0,T=T)
-        records.append({
-            'time'  : i // total_points ,
-            'T'     : T                 ,
-            'VGS'   : Vgs               ,
-            'VDS'   : Vds               ,
-            'ID'    : Id                ,
-            'CGS'   : Cgs               ,  
-            'CGD'   : Cgd               ,
-            'CDS'   : Cds
-        })
-
-    df = pd.DataFrame(records)
-    df.to_csv(path, index=False)
+def simulate_model_adaptive(model, T_values, Vgs_values, Vds_values, path):
+    sweep           = AdaptiveSweep(model, coarse=9, max_depth=5)
+    results         = sweep.run(T_values, (Vgs_values[0], Vgs_values[-1]), (Vds_values[0], Vds_values[-1]))
+    with Writer.open_writer(path, len(results["ID"])) as writer:
+        writer.write(results)
 
 def main():
+    Profile.enable(PROFILE)
     logger.log(data_dict)
-    simulate_model(sh_model     , T_values, Vgs_values, Vds_values, SH_PATH     )
-    simulate_model(bsim3_model  , T_values, Vgs_values, Vds_values, BSIM3_PATH  )
+    simulate    = simulate_model_adaptive if ADAPTIVE else simulate_model
+    for name, path in MODELS.items():
+        model   = Registry.create(name, params=data_dict, eq=equations)
+        with Profile.timer(f"simulate.{name}"):
+            simulate(model, T_values, Vgs_values, Vds_values, path)
 
     if PLOT:
-        plotter = MOSFETModelComparer(BSIM3_PATH,SH_PATH)
-        plotter.plot()
+        with Profile.timer("plot"):
+            plotter = MOSFETModelComparer(BSIM3_PATH,SH_PATH)
+            if REPORT:
+                plotter.report()
+            else:
+                plotter.plot()
+
+    if PROFILE:
+        logger.log_profile(Profile.summary())
 
 #? -------------------------------------------------------------------------------
 if __name__ == "__main__":